@@ -0,0 +1,148 @@
+"""
+Local fake of the OpenAI chat-completions endpoint (standard library only).
+
+Lets the shopping agent and the dashboard run end to end, streaming included,
+without an API key or network access:
+
+    python src/agent/fake_openai.py --port 8765
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake
+    python src/agent/shopper.py --stream
+
+Behaviour is deterministic:
+- last message from the user  -> one `execute_payment` tool call parsed from
+  "buy <item> from <merchant> for $<amount>" (defaults fill any gaps)
+- last message from a tool    -> a short summary of the tool results
+- `--delay` adds latency per response to mimic a slow model
+"""
+import argparse
+import json
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PURCHASE_RE = re.compile(
+    r"(?:buy|get|purchase)\s+(?:me\s+)?(?:an?\s+)?'?(?P<item>.+?)'?"
+    r"(?:\s+from\s+'?(?P<merchant>.+?)'?)?(?:\s+for\s+\$?(?P<amount>[\d,]+(?:\.\d+)?))?\.?$",
+    re.IGNORECASE,
+)
+
+
+def plan_tool_call(text):
+    match = PURCHASE_RE.search(text.strip())
+    groups = match.groupdict() if match else {}
+    return {
+        "merchant_name": groups.get("merchant") or "Generic Store",
+        "amount": float((groups.get("amount") or "100").replace(",", "")),
+        "item_description": groups.get("item") or text.strip()[:60],
+    }
+
+
+def summarize_tools(messages):
+    results = []
+    for m in reversed(messages):
+        if m.get("role") != "tool":
+            break
+        try:
+            results.append(json.loads(m.get("content") or "{}"))
+        except ValueError:
+            results.append({"status": "ERROR"})
+    parts = [f"Transaction {r.get('transaction_id', '?')} is {r.get('status', 'UNKNOWN')}." for r in reversed(results)]
+    return " ".join(parts) or "Done."
+
+
+class FakeCompletions(BaseHTTPRequestHandler):
+    delay = 0.0
+    model = "fake-gpt"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        messages = body.get("messages", [])
+        last = messages[-1] if messages else {"role": "user", "content": ""}
+        time.sleep(self.delay)
+
+        if last.get("role") == "user" and body.get("tools"):
+            args = plan_tool_call(last.get("content") or "")
+            tool_calls = [{
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": "execute_payment", "arguments": json.dumps(args)},
+            }]
+            content = None
+        else:
+            tool_calls = None
+            content = summarize_tools(messages)
+
+        if body.get("stream"):
+            self._send_stream(content, tool_calls)
+        else:
+            self._send_json(content, tool_calls)
+
+    def _envelope(self, obj, choice):
+        return {"id": f"chatcmpl-{uuid.uuid4().hex[:10]}", "object": obj,
+                "created": int(time.time()), "model": self.model, "choices": [choice]}
+
+    def _send_json(self, content, tool_calls):
+        message = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        payload = self._envelope("chat.completion", {
+            "index": 0, "message": message,
+            "finish_reason": "tool_calls" if tool_calls else "stop",
+        })
+        payload["usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, content, tool_calls):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        def emit(delta, finish=None):
+            chunk = self._envelope("chat.completion.chunk", {"index": 0, "delta": delta, "finish_reason": finish})
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        emit({"role": "assistant", "content": ""})
+        if tool_calls:
+            for i, call in enumerate(tool_calls):
+                args = call["function"]["arguments"]
+                emit({"tool_calls": [{"index": i, "id": call["id"], "type": "function",
+                                      "function": {"name": "execute_payment", "arguments": ""}}]})
+                for start in range(0, len(args), 16):
+                    emit({"tool_calls": [{"index": i, "function": {"arguments": args[start:start + 16]}}]})
+            emit({}, "tool_calls")
+        else:
+            for word in re.findall(r"\S+\s*", content or ""):
+                emit({"content": word})
+            emit({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response")
+    args = parser.parse_args(argv)
+
+    FakeCompletions.delay = args.delay
+    server = ThreadingHTTPServer((args.host, args.port), FakeCompletions)
+    print(f"🧪 [FAKE LLM]: listening on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Token-budgeted conversation memory for the chat agent.
+
+Keeps a sliding window of recent turns verbatim and folds anything older
+into a compact running summary, so the prompt sent on each turn stays roughly
+constant in size however long the shopping session runs.
+
+- Token counts are estimated once per message when it is added and kept as
+  a running total. Nothing is re-tokenized per turn.
+- Eviction works on whole turns (a user message plus everything up to the
+  next user message). An assistant `tool_calls` message is never separated
+  from its `tool` replies.
+- The default summarizer is extractive and local (no extra LLM call). Pass
+  `summarizer=` to plug in an LLM-based one.
+"""
+from collections import deque
+
+CHARS_PER_TOKEN = 4        # rough average for English text with GPT tokenizers
+MESSAGE_OVERHEAD = 4       # role/separator tokens per chat message
+SUMMARY_LINE_CHARS = 160
+
+
+def estimate_tokens(message):
+    """Cheap token estimate for one chat message (dict form)"""
+    text = message.get("content") or ""
+    for call in message.get("tool_calls") or []:
+        fn = call.get("function", {})
+        text += fn.get("name", "") + fn.get("arguments", "")
+    return MESSAGE_OVERHEAD + (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def summarize_turn(turn):
+    """Default summarizer: one short line per turn"""
+    parts = []
+    for m in turn:
+        if m["role"] == "tool":
+            parts.append(f"tool -> {m.get('content', '')}")
+        elif m.get("content"):
+            parts.append(f"{m['role']}: {m['content']}")
+        elif m.get("tool_calls"):
+            parts.append("assistant called " + ", ".join(c["function"]["name"] for c in m["tool_calls"]))
+    line = " | ".join(" ".join(p.split()) for p in parts)
+    return line if len(line) <= SUMMARY_LINE_CHARS else line[:SUMMARY_LINE_CHARS - 1] + "…"
+
+
+class ConversationMemory:
+    def __init__(self, token_budget=2000, summary_budget=400, min_recent_turns=2, summarizer=summarize_turn):
+        """
+        token_budget:     max tokens for window + summary (system prompt excluded)
+        summary_budget:   max tokens the summary itself may use; oldest lines drop first
+        min_recent_turns: turns always kept verbatim, even if over budget
+        """
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.min_recent_turns = max(min_recent_turns, 1)  # never evict the turn being built
+        self.summarizer = summarizer
+        self.clear()
+
+    def clear(self):
+        self._turns = deque()          # each: [list of messages, token count]
+        self._window_tokens = 0
+        self._summary = deque()        # (line, token count)
+        self._summary_tokens = 0
+        self.evicted_turns = 0
+
+    # --- writing ---
+    def add(self, message):
+        """Append one chat message (dict). A user message starts a new turn."""
+        message = _as_dict(message)
+        tokens = estimate_tokens(message)
+        if message["role"] == "user" or not self._turns:
+            self._turns.append([[], 0])
+        turn = self._turns[-1]
+        turn[0].append(message)
+        turn[1] += tokens
+        self._window_tokens += tokens
+        self._compact()
+
+    def extend(self, messages):
+        for m in messages:
+            self.add(m)
+
+    def _compact(self):
+        while self._window_tokens + self._summary_tokens > self.token_budget \
+                and len(self._turns) > self.min_recent_turns:
+            messages, tokens = self._turns.popleft()
+            self._window_tokens -= tokens
+            self.evicted_turns += 1
+            line = self.summarizer(messages)
+            if line:
+                line_tokens = estimate_tokens({"content": line}) - MESSAGE_OVERHEAD
+                self._summary.append((line, line_tokens))
+                self._summary_tokens += line_tokens
+            while self._summary and self._summary_tokens > self.summary_budget:
+                _, dropped = self._summary.popleft()
+                self._summary_tokens -= dropped
+
+    # --- reading ---
+    @property
+    def tokens(self):
+        return self._window_tokens + self._summary_tokens
+
+    @property
+    def summary(self):
+        return "\n".join(line for line, _ in self._summary)
+
+    @property
+    def window(self):
+        """Recent messages, verbatim and in order"""
+        return [m for messages, _ in self._turns for m in messages]
+
+    def build(self, system_prompt=None):
+        """The message list to send to chat.completions.create"""
+        out = []
+        if system_prompt:
+            out.append({"role": "system", "content": system_prompt})
+        if self._summary:
+            out.append({"role": "system", "content": "Summary of earlier conversation:\n" + self.summary})
+        out.extend(self.window)
+        return out
+
+
+def _as_dict(message):
+    """Accept OpenAI SDK message objects as well as plain dicts"""
+    if isinstance(message, dict):
+        return message
+    if hasattr(message, "model_dump"):
+        return message.model_dump(exclude_none=True)
+    return dict(vars(message))
@@ -0,0 +1,127 @@
+"""
+Assistant reply helpers shared by the CLI agent and the dashboard.
+
+- templated_reply(): the "fast path". When every tool result is one of the
+  risk engine's deterministic outcomes, the wording is fixed anyway, so we
+  render it locally instead of spending a second LLM round trip on it.
+- StreamedMessage: wraps a `stream=True` chat completion, yields text as it
+  arrives and reassembles any tool calls from their deltas.
+"""
+from types import SimpleNamespace
+
+FAST_PATH_TEMPLATES = {
+    "APPROVED": (
+        "Transaction approved: {item} from {merchant} for {amount}. "
+        "Please complete the payment using the secure checkout below."
+    ),
+    "PENDING_APPROVAL": (
+        "I've set up the purchase of {item} from {merchant} for {amount}, "
+        "but it needs your approval first ({reason}). Check the Admin Dashboard."
+    ),
+    "DENIED": "The purchase of {item} from {merchant} for {amount} was denied: {reason}.",
+}
+# Same symbols/decimals as the API's Money; other currencies print their ISO code
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥"}
+ZERO_DECIMAL_CURRENCIES = {"JPY"}
+
+
+def format_amount(amount, currency="USD"):
+    """12.5, "EUR" -> "€12.50"; 9.99, "CHF" -> "9.99 CHF" """
+    currency = (currency or "USD").upper()
+    value = f"{amount:,.{0 if currency in ZERO_DECIMAL_CURRENCIES else 2}f}"
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    return f"{symbol}{value}" if symbol else f"{value} {currency}"
+
+
+def _reason(message):
+    # "Risk Triggered: <reason>. Waiting for user." -> "<reason>"
+    if message.startswith("Risk Triggered: "):
+        message = message[len("Risk Triggered: "):].split(". Waiting")[0]
+    return message.rstrip(".") or "no reason given"
+
+
+def templated_reply(outcomes):
+    """
+    outcomes: list of (tool_args, api_result) pairs, one per execute_payment call.
+    Returns the reply text, or None if any outcome needs the LLM to phrase it
+    (errors, unknown statuses).
+    """
+    if not outcomes:
+        return None
+    lines = []
+    for args, result in outcomes:
+        template = FAST_PATH_TEMPLATES.get(result.get("status"))
+        if template is None:
+            return None
+        try:
+            amount = float(result.get("amount") or args.get("amount") or 0)
+        except (TypeError, ValueError):
+            return None
+        lines.append(template.format(
+            item=args.get("item_description", "the item"),
+            merchant=args.get("merchant_name", "the merchant"),
+            amount=format_amount(amount, result.get("currency") or args.get("currency")),
+            reason=_reason(result.get("message", "")),
+        ))
+    return "\n\n".join(lines)
+
+
+class StreamedMessage:
+    """
+    Iterate to receive content deltas; afterwards `.content` and `.tool_calls`
+    hold the complete message (tool_calls shaped like the OpenAI SDK objects).
+
+        stream = StreamedMessage(client.chat.completions.create(..., stream=True))
+        for text in stream:
+            print(text, end="", flush=True)
+        if stream.tool_calls: ...
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._parts = []
+        self._calls = {}
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            for tc in getattr(delta, "tool_calls", None) or []:
+                call = self._calls.setdefault(tc.index, {"id": None, "name": "", "arguments": []})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    if tc.function.name:
+                        call["name"] += tc.function.name
+                    if tc.function.arguments:
+                        call["arguments"].append(tc.function.arguments)
+            if getattr(delta, "content", None):
+                self._parts.append(delta.content)
+                yield delta.content
+
+    @property
+    def content(self):
+        return "".join(self._parts) or None
+
+    @property
+    def tool_calls(self):
+        return [
+            SimpleNamespace(
+                id=call["id"],
+                type="function",
+                function=SimpleNamespace(name=call["name"], arguments="".join(call["arguments"])),
+            )
+            for _, call in sorted(self._calls.items())
+        ] or None
+
+    def to_message(self):
+        """The assistant message to append to the conversation history"""
+        message = {"role": "assistant", "content": self.content}
+        if self.tool_calls:
+            message["tool_calls"] = [
+                {"id": c.id, "type": "function",
+                 "function": {"name": c.function.name, "arguments": c.function.arguments}}
+                for c in self.tool_calls
+            ]
+        return message
@@ -0,0 +1,142 @@
+"""
+Tool-call execution shared by the CLI agent and the dashboard.
+
+When the model returns several `execute_payment` calls (a multi-item cart),
+they are authorized together through /v1/agent/pay/batch: one HTTP round trip
+instead of N sequential ones. Outcomes come back in tool-call order, so the
+tool messages line up with the assistant message that requested them.
+"""
+import json
+from dataclasses import dataclass
+
+import requests
+
+PAY_PATH = "/v1/agent/pay"
+BATCH_PATH = "/v1/agent/pay/batch"
+MAX_BATCH = 50     # the gateway's MAX_BATCH_PAYMENTS
+TIMEOUT = (2, 15)  # (connect, read) seconds
+
+
+@dataclass
+class ToolOutcome:
+    tool_call: object       # the SDK tool call (has .id and .function)
+    args: dict
+    result: dict
+
+    def to_message(self):
+        """The `role: tool` message answering this tool call"""
+        return {
+            "tool_call_id": self.tool_call.id,
+            "role": "tool",
+            "name": self.tool_call.function.name,
+            "content": json.dumps(self.result),
+        }
+
+
+_default_session = None
+
+
+def default_session():
+    """Module-wide pooled session (keep-alive across agent turns)"""
+    global _default_session
+    if _default_session is None:
+        _default_session = requests.Session()
+    return _default_session
+
+
+def _payload(args, agent_id):
+    return {
+        "agent_id": agent_id,
+        "merchant_name": args.get("merchant_name"),
+        "amount": args.get("amount"),
+        "item_description": args.get("item_description"),
+        "currency": args.get("currency") or "USD",
+    }
+
+
+def _invalid(args):
+    """Why these execute_payment arguments would be rejected by the gateway, or None"""
+    if not isinstance(args, dict):
+        return "Bad arguments: expected a JSON object"
+    for field in ("merchant_name", "item_description"):
+        if not isinstance(args.get(field), str) or not args[field].strip():
+            return f"Bad arguments: {field} is required"
+    amount = args.get("amount")
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        return "Bad arguments: amount must be a number"
+    if args.get("currency") is not None and not isinstance(args["currency"], str):
+        return "Bad arguments: currency must be a string"
+    return None
+
+
+def run_tool_calls(tool_calls, agent_id, api_base, session=None):
+    """
+    Execute every tool call and return a ToolOutcome per call, in order.
+    Payments go out as batch requests (or a plain /pay for a single item);
+    unknown tools and malformed arguments become ERROR results without a
+    network call.
+    """
+    session = session or default_session()
+    outcomes = [None] * len(tool_calls)
+    payments = []  # (position, args)
+
+    for i, tool_call in enumerate(tool_calls):
+        try:
+            args = json.loads(tool_call.function.arguments or "{}")
+        except ValueError as e:
+            outcomes[i] = ToolOutcome(tool_call, {}, {"status": "ERROR", "message": f"Bad arguments: {e}"})
+            continue
+        if tool_call.function.name != "execute_payment":
+            outcomes[i] = ToolOutcome(tool_call, args, {"status": "ERROR", "message": "Unknown tool"})
+            continue
+        problem = _invalid(args)
+        if problem:
+            outcomes[i] = ToolOutcome(tool_call, args if isinstance(args, dict) else {},
+                                      {"status": "ERROR", "message": problem})
+            continue
+        payments.append((i, args))
+
+    if payments:
+        for (i, args), result in zip(payments, _authorize([a for _, a in payments], agent_id, api_base, session)):
+            outcomes[i] = ToolOutcome(tool_calls[i], args, result)
+    return outcomes
+
+
+def _gateway_error(res):
+    return {"status": "ERROR", "message": f"Gateway error {res.status_code}: {res.text}"}
+
+
+def _pay_one(args, agent_id, api_base, session):
+    try:
+        res = session.post(f"{api_base}{PAY_PATH}", json=_payload(args, agent_id), timeout=TIMEOUT)
+        return res.json() if res.status_code == 200 else _gateway_error(res)
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+
+def _authorize(all_args, agent_id, api_base, session):
+    """One result per payment, in order; batches of at most MAX_BATCH items"""
+    results = []
+    for start in range(0, len(all_args), MAX_BATCH):
+        chunk = all_args[start:start + MAX_BATCH]
+        if len(chunk) == 1:
+            results.append(_pay_one(chunk[0], agent_id, api_base, session))
+            continue
+        try:
+            res = session.post(
+                f"{api_base}{BATCH_PATH}",
+                json={"payments": [_payload(a, agent_id) for a in chunk]},
+                timeout=TIMEOUT,
+            )
+        except Exception as e:
+            # The batch may have been applied before the connection dropped:
+            # retrying item by item could authorize the cart twice
+            results.extend([{"status": "ERROR", "message": str(e)}] * len(chunk))
+            continue
+        if res.status_code == 200:
+            results.extend(res.json())
+        else:
+            # The gateway rejected the whole batch, so nothing was authorized;
+            # send the items one by one so only the bad one comes back as ERROR
+            results.extend(_pay_one(a, agent_id, api_base, session) for a in chunk)
+    return results
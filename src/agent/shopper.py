@@ -1,23 +1,32 @@
 import os
 import sys
-import json
-import requests
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from replies import StreamedMessage, templated_reply
+from runtime import run_tool_calls
+from memory import ConversationMemory
+
 # Load environment variables from .env file (if it exists)
 # This supports local development while allowing production to use system env vars
 load_dotenv()
 
 # --- CONFIGURATION ---
-if "OPENAI_API_KEY" not in os.environ:
-    print("⚠️  ERROR: OPENAI_API_KEY not found.")
-    print("👉 Option 1: Create a .env file with: OPENAI_API_KEY=sk-...")
-    print("👉 Option 2: Run: export OPENAI_API_KEY='sk-...'")
-    sys.exit(1)
+API_BASE = "http://127.0.0.1:8000"
+API_URL = f"{API_BASE}/v1/agent/pay"
+client = None
 
-client = OpenAI() # Uses the env var automatically
-API_URL = "http://127.0.0.1:8000/v1/agent/pay"
+def get_client():
+    """Create the OpenAI client on first use (simulation mode never needs one)"""
+    global client
+    if client is None:
+        if "OPENAI_API_KEY" not in os.environ:
+            print("⚠️  ERROR: OPENAI_API_KEY not found.")
+            print("👉 Option 1: Create a .env file with: OPENAI_API_KEY=sk-...")
+            print("👉 Option 2: Run: export OPENAI_API_KEY='sk-...'")
+            sys.exit(1)
+        client = OpenAI() # Uses the env var automatically
+    return client
 
 # --- 1. DEFINE THE TOOL (Function Schema) ---
 tools = [
@@ -32,6 +41,7 @@ tools = [
                     "merchant_name": {"type": "string"},
                     "amount": {"type": "number"},
                     "item_description": {"type": "string"},
+                    "currency": {"type": "string", "description": "ISO 4217 code, default USD"},
                 },
                 "required": ["merchant_name", "amount", "item_description"],
             },
@@ -40,29 +50,40 @@ tools = [
 ]
 
 # --- 2. THE HELPER FUNCTION (Executes the code) ---
-def execute_payment(merchant_name, amount, item_description):
-    print(f"\n💳 [GATEWAY]: Processing ${amount} for {merchant_name}...")
-    payload = {
-        "agent_id": "gpt_agent_01",
+def build_payment_payload(merchant_name, amount, item_description, agent_id="gpt_agent_01", currency="USD"):
+    return {
+        "agent_id": agent_id,
         "merchant_name": merchant_name,
         "amount": amount,
-        "item_description": item_description
+        "item_description": item_description,
+        "currency": currency,
     }
-    try:
-        res = requests.post(API_URL, json=payload)
-        return json.dumps(res.json())
-    except Exception as e:
-        return json.dumps({"status": "ERROR", "message": str(e)})
 
 # --- 3. THE AGENT LOOP ---
-def run_agent():
+def _print_banner():
+    print("\n########################")
+    print("## FINAL AGENT OUTPUT ##")
+    print("########################")
+
+SYSTEM_PROMPT = "You are a shopping assistant. You must use the 'execute_payment' tool to complete purchases."
+DEFAULT_PROMPT = "Buy a 'Mega Mystery Box' from 'DarkWebStore' for $45.00."
+
+def run_agent(prompt=DEFAULT_PROMPT, memory=None, stream=False, fast_path=True):
+    """
+    prompt:    the user's request
+    memory:    ConversationMemory to continue (a fresh one if omitted); keeps
+               the prompt size bounded across many turns
+    stream:    print model tokens as they arrive instead of waiting for the full reply
+    fast_path: skip the second LLM call when the outcome is deterministic
+               (APPROVED / PENDING_APPROVAL / DENIED) and use a template instead
+    """
+    client = get_client()
     print("🤖 [AGENT]: Authenticated with OpenAI. Reading instructions...")
     
     # The User Prompt
-    messages = [
-        {"role": "system", "content": "You are a shopping assistant. You must use the 'execute_payment' tool to complete purchases."},
-        {"role": "user", "content": "Buy a 'Mega Mystery Box' from 'DarkWebStore' for $45.00."}
-    ]
+    memory = memory if memory is not None else ConversationMemory()
+    memory.add({"role": "user", "content": prompt})
+    messages = memory.build(SYSTEM_PROMPT)
 
     print("🧠 [AGENT]: Thinking...")
     
@@ -72,52 +93,84 @@ def run_agent():
         messages=messages,
         tools=tools,
         tool_choice="auto", 
+        stream=stream,
     )
 
-    response_message = response.choices[0].message
-    tool_calls = response_message.tool_calls
+    if stream:
+        response_message = StreamedMessage(response)
+        for text in response_message:
+            print(text, end="", flush=True)  # Any direct reply shows up immediately
+        tool_calls = response_message.tool_calls
+        assistant_entry = response_message.to_message()
+    else:
+        response_message = response.choices[0].message
+        tool_calls = response_message.tool_calls
+        assistant_entry = response_message
+        if not tool_calls and response_message.content:
+            print(response_message.content)
+
+    memory.add(assistant_entry)  # Extend conversation history
 
     # Check if AI wanted to use the tool
     if tool_calls:
-        messages.append(response_message)  # Extend conversation history
-
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
-            
-            if function_name == "execute_payment":
-                # Execute the payment against your Local API
-                function_response = execute_payment(
-                    merchant_name=function_args.get("merchant_name"),
-                    amount=function_args.get("amount"),
-                    item_description=function_args.get("item_description"),
-                )
-                
-                # Send the result back to the AI
-                messages.append(
-                    {
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": function_response,
-                    }
-                )
-
-        # Second Call: AI summarizes the result
-        print("🧠 [AGENT]: Processing transaction result...")
-        second_response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-        )
-        
-        print("\n########################")
-        print("## FINAL AGENT OUTPUT ##")
-        print("########################")
-        print(second_response.choices[0].message.content)
+
+        # Execute every payment against your Local API in one batch round trip
+        print(f"\n💳 [GATEWAY]: Processing {len(tool_calls)} payment(s)...")
+        outcomes = run_tool_calls(tool_calls, agent_id="gpt_agent_01", api_base=API_BASE)
+        for o in outcomes:
+            print(f"💳 [GATEWAY]: ${o.args.get('amount')} for {o.args.get('merchant_name')} -> {o.result.get('status')}")
+
+        # Send the results back to the AI, in tool-call order
+        memory.extend(o.to_message() for o in outcomes)
+
+        # Fast path: the decision is already final, no need to ask the model to phrase it
+        reply = templated_reply([(o.args, o.result) for o in outcomes]) if fast_path else None
+        if reply is not None:
+            _print_banner()
+            print(reply)
+        else:
+            # Second Call: AI summarizes the result
+            print("🧠 [AGENT]: Processing transaction result...")
+            second_response = client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=memory.build(SYSTEM_PROMPT),
+                stream=stream,
+            )
+
+            _print_banner()
+            if stream:
+                streamed = StreamedMessage(second_response)
+                for text in streamed:
+                    print(text, end="", flush=True)
+                print()
+                reply = streamed.content
+            else:
+                reply = second_response.choices[0].message.content
+                print(reply)
+        memory.add({"role": "assistant", "content": reply})
         
         # Helper log for the demo
-        if "PENDING_APPROVAL" in str(messages):
+        if any(o.result.get("status") == "PENDING_APPROVAL" for o in outcomes):
             print("\n👉 ACTION REQUIRED: Check your Dashboard!")
+    return memory
 
 if __name__ == "__main__":
-    run_agent()
\ No newline at end of file
+    # python src/agent/shopper.py --simulate <scenario.json>  -> offline load test
+    if len(sys.argv) > 1 and sys.argv[1] == "--simulate":
+        from simulation import main as run_simulation
+        sys.exit(run_simulation(sys.argv[2:]))
+    # --stream: print tokens as they arrive; --no-fast-path: always make the second LLM call
+    options = {"stream": "--stream" in sys.argv, "fast_path": "--no-fast-path" not in sys.argv}
+    if "--chat" in sys.argv:
+        # Interactive session: one bounded memory carried across turns
+        memory = ConversationMemory()
+        while True:
+            try:
+                prompt = input("\n🛒 You: ").strip()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if prompt:
+                run_agent(prompt, memory=memory, **options)
+                print(f"🧾 [MEMORY]: ~{memory.tokens} tokens, {memory.evicted_turns} turn(s) summarized")
+    else:
+        run_agent(**options)
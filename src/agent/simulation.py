@@ -0,0 +1,231 @@
+"""
+Multi-agent load simulation for the AgentGuard API.
+
+Runs thousands of synthetic shopping agents concurrently against the real
+risk engine. The LLM tool-calling step is replaced by ScriptedLLM, a
+deterministic stand-in that emits `execute_payment` tool calls drawn from a
+scenario file, so runs are reproducible and need no network access or
+OpenAI key.
+
+Each approved payment is then captured (/v1/agent/complete_payment charges
+the budget ledger), so later decisions run against a shrinking budget and the
+ledger's totals can be checked against every configured window afterwards.
+
+Usage:
+    python src/agent/simulation.py src/agent/scenarios/bursty_mix.json
+    python src/agent/shopper.py --simulate src/agent/scenarios/bursty_mix.json --agents 5000
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+
+import httpx
+
+from shopper import API_BASE, API_URL, build_payment_payload, tools
+
+CAPTURE_URL = f"{API_BASE}/v1/agent/complete_payment"
+
+DEFAULT_SCENARIO = {
+    "seed": 42,
+    "agents": 1000,
+    "turns_per_agent": 3,
+    "concurrency": 200,
+    "burst_size": 250,
+    "burst_pause_ms": 200,
+    "reset_before_run": False,
+    "capture": True,
+    "intents": [
+        {"weight": 10, "merchant_name": "Starbucks", "item_description": "Latte", "amount": [3, 8]},
+        {"weight": 3, "merchant_name": "Apple", "item_description": "MacBook Pro", "amount": [1500, 3000]},
+    ],
+}
+
+
+# --- 1. THE STAND-IN LLM ---
+class ScriptedLLM:
+    """
+    Deterministic replacement for `client.chat.completions.create`.
+    Returns objects shaped like the OpenAI SDK response, with one or more
+    `execute_payment` tool calls chosen from the scenario's weighted intents.
+    """
+
+    def __init__(self, intents, seed):
+        self.intents = intents
+        self.weights = [i.get("weight", 1) for i in intents]
+        self.seed = seed
+
+    def for_agent(self, agent_index):
+        return _AgentScript(self, random.Random(f"{self.seed}:{agent_index}"))
+
+
+class _AgentScript:
+    def __init__(self, llm, rng):
+        self.llm = llm
+        self.rng = rng
+
+    def create(self, messages, tools=None, **kwargs):
+        intent = self.rng.choices(self.llm.intents, weights=self.llm.weights, k=1)[0]
+        low, high = intent["amount"] if isinstance(intent["amount"], list) else (intent["amount"],) * 2
+        args = {
+            "merchant_name": intent["merchant_name"],
+            "amount": round(self.rng.uniform(low, high), 2),
+            "item_description": intent["item_description"],
+        }
+        tool_call = SimpleNamespace(
+            id=f"call_{uuid.UUID(int=self.rng.getrandbits(128)).hex[:12]}",
+            type="function",
+            function=SimpleNamespace(name="execute_payment", arguments=json.dumps(args)),
+        )
+        message = SimpleNamespace(role="assistant", content=None, tool_calls=[tool_call])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+# --- 2. ONE SYNTHETIC AGENT ---
+async def run_synthetic_agent(index, llm, http, gate, turns, capture, results):
+    script = llm.for_agent(index)
+    agent_id = f"sim_agent_{index:05d}"
+    messages = [{"role": "system", "content": "You are a shopping assistant."}]
+
+    for _ in range(turns):
+        response = script.create(messages=messages, tools=tools, tool_choice="auto")
+        for tool_call in response.choices[0].message.tool_calls:
+            args = json.loads(tool_call.function.arguments)
+            payload = build_payment_payload(agent_id=agent_id, **args)
+            async with gate:
+                started = time.perf_counter()
+                try:
+                    res = await http.post(API_URL, json=payload)
+                    body = res.json()
+                    status = body.get("status", f"HTTP_{res.status_code}")
+                except Exception as e:
+                    body = {"status": "ERROR", "message": str(e)}
+                    status = "ERROR"
+                elapsed = time.perf_counter() - started
+                captured = False
+                if capture and status == "APPROVED":
+                    # Stand-in for the PayPal checkout: mark paid, which charges the ledger
+                    tx_id = body["transaction_id"]
+                    try:
+                        res = await http.post(CAPTURE_URL, json={"transaction_id": tx_id,
+                                                                 "paypal_order_id": f"SIM-{tx_id}"})
+                        captured = res.status_code == 200
+                    except Exception:
+                        pass
+            results.append((payload["amount"], status, body.get("message", ""), elapsed, captured))
+
+
+# --- 3. THE HARNESS ---
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+
+async def run_simulation(scenario):
+    llm = ScriptedLLM(scenario["intents"], scenario["seed"])
+    gate = asyncio.Semaphore(scenario["concurrency"])
+    limits = httpx.Limits(max_connections=scenario["concurrency"], max_keepalive_connections=scenario["concurrency"])
+    results = []
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as http:
+        if scenario.get("reset_before_run"):
+            await http.post(f"{API_BASE}/reset")
+        before = (await http.get(f"{API_BASE}/config")).json()
+
+        started = time.perf_counter()
+        tasks = []
+        burst = max(scenario["burst_size"], 1)
+        for first in range(0, scenario["agents"], burst):
+            for index in range(first, min(first + burst, scenario["agents"])):
+                tasks.append(asyncio.create_task(
+                    run_synthetic_agent(index, llm, http, gate, scenario["turns_per_agent"],
+                                        scenario.get("capture", True), results)
+                ))
+            if first + burst < scenario["agents"]:
+                await asyncio.sleep(scenario["burst_pause_ms"] / 1000)
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - started
+        after = (await http.get(f"{API_BASE}/config")).json()
+
+    return summarize(results, wall, _windows(before), _windows(after))
+
+
+def _windows(config):
+    """{window: {bucket, limit, spent}} for the base currency, from /config"""
+    return config["budgets"][config["currency"]]["windows"]
+
+
+def summarize(results, wall, before, after):
+    latencies = sorted(r[3] for r in results)
+    statuses = Counter(r[1] for r in results)
+    captured = round(sum(r[0] for r in results if r[4]), 2)
+
+    # Budget correctness, per configured window (day, plus hour/week if set):
+    # spend must stay within the limit, and when the bucket did not roll over
+    # during the run it must have grown by exactly what was captured.
+    budget = {}
+    violations = []
+    for window, end in after.items():
+        start = before.get(window, {})
+        expected = round(start.get("spent", 0) + captured, 2) if start.get("bucket") == end["bucket"] else None
+        budget[window] = {"limit": end["limit"], "spent": end["spent"], "expected_spent": expected}
+        if end["spent"] > end["limit"] or (expected is not None and abs(end["spent"] - expected) > 0.005):
+            violations.append(window)
+    return {
+        "requests": len(results),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p95": round(_percentile(latencies, 95) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "statuses": dict(statuses),
+        "captured": captured,
+        "budget": budget,
+        "budget_violations": violations,
+    }
+
+
+def load_scenario(path=None, overrides=None):
+    scenario = dict(DEFAULT_SCENARIO)
+    if path:
+        with open(path) as f:
+            scenario.update(json.load(f))
+    scenario.update({k: v for k, v in (overrides or {}).items() if v is not None})
+    return scenario
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent synthetic-agent load test for AgentGuard")
+    parser.add_argument("scenario", nargs="?", help="Scenario JSON file")
+    parser.add_argument("--agents", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--reset", dest="reset_before_run", action="store_true", default=None,
+                        help="POST /reset before the run")
+    args = parser.parse_args(argv)
+
+    scenario = load_scenario(args.scenario, {
+        "agents": args.agents,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "reset_before_run": args.reset_before_run,
+    })
+    print(f"🚦 [SIM]: {scenario['agents']} agents x {scenario['turns_per_agent']} turns, "
+          f"concurrency {scenario['concurrency']}, seed {scenario['seed']}")
+    report = asyncio.run(run_simulation(scenario))
+    print(json.dumps(report, indent=2))
+    return 1 if report["budget_violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
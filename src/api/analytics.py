@@ -0,0 +1,214 @@
+"""
+Incremental spend analytics.
+
+SpendRollups is updated on every transaction state change (create, human
+decision, capture, refund), so queries read pre-aggregated cells and cost
+O(buckets), never O(transactions):
+
+    dimension ("merchant" | "agent" | "status" | "hour") -> key -> (status, currency) -> [count, minor units]
+
+It also keeps decision counters (auto/human, approve/deny) for approval
+rates, and a t-digest of time-to-decision for percentiles in constant
+memory. Hour buckets use the budget timezone and only the most recent
+HOURS_KEPT are retained.
+"""
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+
+from src.api.ledger import tzinfo_for, window_bounds
+from src.api.money import Money
+
+DIMENSIONS = ("merchant", "agent", "status", "hour")
+APPROVED_STATUSES = ("APPROVED", "COMPLETED")
+HOURS_KEPT = 168  # one week of hourly buckets
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning): a few hundred centroids summarise any number of
+    samples, with the best accuracy near the tails (p99), where it matters.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self._centroids = []   # [(mean, weight)] sorted by mean
+        self._buffer = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1):
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._merge()
+
+    def _k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _merge(self):
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(w for _, w in items)
+        merged = []
+        mean, weight = items[0]
+        cumulative = 0.0
+        k_left = self._k(0.0)
+        for m, w in items[1:]:
+            if self._k((cumulative + weight + w) / total) - k_left <= 1:
+                weight += w
+                mean += (m - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                cumulative += weight
+                k_left = self._k(cumulative / total)
+                mean, weight = m, w
+        merged.append((mean, weight))
+        self._centroids = merged
+
+    def quantile(self, q):
+        self._merge()
+        if not self._centroids:
+            return None
+        if len(self._centroids) == 1:
+            return self._centroids[0][0]
+        target = q * self.count
+        cumulative = 0.0
+        prev_center, prev_mean = 0.0, self.min
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - prev_center
+                return prev_mean + (mean - prev_mean) * ((target - prev_center) / span if span else 0)
+            cumulative += weight
+            prev_center, prev_mean = center, mean
+        span = self.count - prev_center
+        return prev_mean + (self.max - prev_mean) * ((target - prev_center) / span if span else 0)
+
+    def summary(self, quantiles=(0.5, 0.9, 0.99)):
+        out = {"count": self.count}
+        for q in quantiles:
+            value = self.quantile(q)
+            out[f"p{round(q * 100)}"] = None if value is None else round(value, 3)
+        return out
+
+
+class SpendRollups:
+    def __init__(self, tz="UTC", clock=time.time):
+        self._tz = tzinfo_for(tz)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._cells = {d: {} for d in DIMENSIONS}
+        self._hour_starts = {}  # hour label -> epoch start (ordering/eviction)
+        self._decisions = {"auto_approved": 0, "auto_denied": 0, "flagged": 0,
+                           "human_approved": 0, "human_denied": 0}
+        self._time_to_approve = TDigest()
+        self._time_to_decide = TDigest()
+
+    def _hour(self, created_at, create):
+        label, end = window_bounds("hour", created_at, self._tz)
+        if label not in self._hour_starts:
+            if not create:
+                return None  # bucket already aged out
+            self._hour_starts[label] = end - 3600
+            if len(self._hour_starts) > HOURS_KEPT:
+                oldest = min(self._hour_starts, key=self._hour_starts.get)
+                del self._hour_starts[oldest]
+                self._cells["hour"].pop(oldest, None)
+        return label
+
+    def _bump(self, merchant, agent_id, money, created_at, status, sign, create=False):
+        keys = {"merchant": merchant, "agent": agent_id or "unknown", "status": status,
+                "hour": self._hour(created_at, create)}
+        cell_key = (status, money.currency)
+        for dimension, key in keys.items():
+            if key is None:
+                continue
+            cells = self._cells[dimension].setdefault(key, {})
+            cell = cells.setdefault(cell_key, [0, 0])
+            cell[0] += sign
+            cell[1] += sign * money.minor
+
+    def record_new(self, merchant, agent_id, money, created_at, status):
+        """A fresh decision from the risk engine (stored or not)"""
+        with self._lock:
+            self._bump(merchant, agent_id, money, created_at, status, 1, create=True)
+            self._decisions[{"APPROVED": "auto_approved", "DENIED": "auto_denied"}.get(status, "flagged")] += 1
+
+    def record_transition(self, tx, old_status, new_status):
+        """Move a stored transaction between statuses; human decisions also feed the latency digests"""
+        old_status, new_status = str(old_status), str(new_status)
+        if old_status == new_status:
+            return
+        with self._lock:
+            self._bump(tx.merchant, tx.agent_id, tx.money, tx.created_at, old_status, -1)
+            self._bump(tx.merchant, tx.agent_id, tx.money, tx.created_at, new_status, 1)
+            if old_status == "PENDING_APPROVAL":
+                waited = max(0.0, self._clock() - tx.created_at)
+                self._time_to_decide.add(waited)
+                if new_status == "APPROVED":
+                    self._decisions["human_approved"] += 1
+                    self._time_to_approve.add(waited)
+                else:
+                    self._decisions["human_denied"] += 1
+
+    def _row(self, key, cells, currency):
+        row = {"key": key, "count": 0, "by_status": {}, "requested": {}, "approved": {}, "captured": {}}
+        for (status, cur), (count, minor) in cells.items():
+            if not count:
+                continue
+            row["count"] += count
+            row["by_status"][status] = row["by_status"].get(status, 0) + count
+            for bucket, statuses in (("requested", None), ("approved", APPROVED_STATUSES), ("captured", ("COMPLETED",))):
+                if statuses is None or status in statuses:
+                    row[bucket][cur] = row[bucket].get(cur, 0) + minor
+        for bucket in ("requested", "approved", "captured"):
+            row[bucket] = {cur: Money(v, cur).to_float() for cur, v in row[bucket].items()}
+        row["sort_spend"] = row["approved"].get(currency, 0.0)
+        return row
+
+    def breakdown(self, dimension, top=None, sort="spend", currency="USD"):
+        """Rows for one dimension: counts per status and requested/approved/captured spend per currency"""
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"dimension must be one of {DIMENSIONS}")
+        with self._lock:
+            rows = [self._row(key, cells, currency) for key, cells in self._cells[dimension].items()]
+            starts = dict(self._hour_starts)
+        rows = [r for r in rows if r["count"]]
+        if dimension == "hour":
+            rows.sort(key=lambda r: starts.get(r["key"], 0))
+            rows = rows[-top:] if top else rows
+        else:
+            rank = (lambda r: (r["sort_spend"], r["count"])) if sort == "spend" else (lambda r: (r["count"], r["sort_spend"]))
+            rows = heapq.nlargest(top, rows, key=rank) if top else sorted(rows, key=rank, reverse=True)
+        for r in rows:
+            del r["sort_spend"]
+        return rows
+
+    def summary(self):
+        with self._lock:
+            d = dict(self._decisions)
+            approve_latency = self._time_to_approve.summary()
+            decide_latency = self._time_to_decide.summary()
+        automatic = d["auto_approved"] + d["auto_denied"] + d["flagged"]
+        human = d["human_approved"] + d["human_denied"]
+        return {
+            "decisions": d,
+            "auto_approval_rate": d["auto_approved"] / automatic if automatic else None,
+            "flag_rate": d["flagged"] / automatic if automatic else None,
+            "human_approval_rate": d["human_approved"] / human if human else None,
+            "overall_approval_rate": (d["auto_approved"] + d["human_approved"]) / automatic if automatic else None,
+            "time_to_approve_seconds": approve_latency,
+            "time_to_decide_seconds": decide_latency,
+            "generated_at": datetime.fromtimestamp(self._clock(), self._tz).isoformat(),
+        }
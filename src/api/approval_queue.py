@@ -0,0 +1,113 @@
+"""
+Priority-ordered queue of PENDING_APPROVAL transactions.
+
+priority = amount score + risk severity + AGE_WEIGHT * age_in_minutes
+
+The amount score is taken from the amount's share of that currency's daily
+budget, so ¥5,000 does not outrank $4,000.
+
+Age grows at the same rate for every item, so ranking by
+(amount score + severity - AGE_WEIGHT * created_minute) is stable over time and
+can live in a heap. Push is O(log n); removal is O(1) (lazy) with the stale
+entry dropped when it reaches the top.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+
+# How much each risk reason pushes an item up the queue
+RISK_SEVERITY = {
+    "Merchant resembles a blocked merchant": 35.0,
+    "Suspicious merchant detected": 30.0,
+    "High-risk item category detected": 25.0,
+    "Amount exceeds auto-approval limit": 15.0,
+}
+DEFAULT_SEVERITY = 10.0
+AMOUNT_WEIGHT = 10.0   # points per order of magnitude of the amount
+AMOUNT_SCALE = 10000.0  # budget fractions are scaled so a full day's budget scores 40 points
+AGE_WEIGHT = 1.0       # points per minute waiting
+
+
+def base_priority(amount, risk_reason, budget=None):
+    """Time-independent part of the priority score (amount: Money, budget: that currency's daily Money)"""
+    if budget is not None and budget.minor > 0:
+        size = AMOUNT_SCALE * amount.minor / budget.minor
+    else:
+        size = amount.to_float()
+    amount_score = AMOUNT_WEIGHT * math.log10(max(size, 0) + 1)
+    return amount_score + RISK_SEVERITY.get(risk_reason, DEFAULT_SEVERITY)
+
+
+class ApprovalQueue:
+    def __init__(self, clock=time.time, budgets=None):
+        self._clock = clock
+        self._budgets = budgets or {}  # {currency: daily budget Money}
+        self._heap = []            # (-rank, seq, tx_id)
+        self._entries = {}         # tx_id -> (base, created_at, tx, seq)
+        self._seq = itertools.count()
+        self._stale = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def push(self, tx, created_at=None):
+        """Add (or re-add) a pending Transaction record"""
+        created_at = self._clock() if created_at is None else created_at
+        base = base_priority(tx.money, tx.risk_reason, self._budgets.get(tx.currency))
+        rank = base - AGE_WEIGHT * created_at / 60.0
+        with self._lock:
+            if tx.id in self._entries:
+                self._stale += 1
+            seq = next(self._seq)
+            self._entries[tx.id] = (base, created_at, tx, seq)
+            heapq.heappush(self._heap, (-rank, seq, tx.id))
+
+    def remove(self, tx_id):
+        """Drop an item once it is decided; returns False if it was not queued"""
+        with self._lock:
+            if self._entries.pop(tx_id, None) is None:
+                return False
+            self._stale += 1
+            if self._stale > len(self._entries) and self._stale > 64:
+                self._compact()
+            return True
+
+    def pending(self):
+        """Snapshot of the queued Transaction records (O(pending), not O(all transactions))"""
+        with self._lock:
+            return [entry[2] for entry in self._entries.values()]
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+            self._stale = 0
+
+    def top(self, k=10):
+        """The k most urgent items, highest priority first (O(k log n))"""
+        now = self._clock()
+        out = []
+        with self._lock:
+            popped = []
+            while self._heap and len(out) < k:
+                item = heapq.heappop(self._heap)
+                tx_id = item[2]
+                entry = self._entries.get(tx_id)
+                if entry is None or entry[3] != item[1]:
+                    self._stale -= 1
+                    continue
+                popped.append(item)
+                base, created_at, tx, _ = entry
+                out.append({**tx.to_dict(), "priority": round(base + AGE_WEIGHT * max(now - created_at, 0) / 60.0, 2)})
+            for item in popped:
+                heapq.heappush(self._heap, item)
+        return out
+
+    def _compact(self):
+        self._heap = [item for item in self._heap
+                      if item[2] in self._entries and self._entries[item[2]][3] == item[1]]
+        heapq.heapify(self._heap)
+        self._stale = 0
@@ -0,0 +1,110 @@
+"""
+Streaming exporters for the transaction log.
+
+Rows are encoded in fixed-size batches and yielded as they are produced, so an
+export of millions of rows never materialises the whole file in memory.
+"""
+import csv
+import io
+
+from src.api.records import columnar
+
+EXPORT_COLUMNS = ["id", "timestamp", "agent_id", "merchant", "amount", "amount_minor", "currency",
+                  "item", "status", "risk_reason"]
+BATCH_SIZE = 5000
+
+
+def _batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(rows, columns=EXPORT_COLUMNS):
+    """Yield CSV text chunks (header first, then one chunk per batch) from Transaction records"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    yield buf.getvalue()
+    for batch in _batches(rows):
+        buf.seek(0)
+        buf.truncate(0)
+        writer.writerows(zip(*columnar(batch, columns).values()))
+        yield buf.getvalue()
+
+
+class _ChunkSink:
+    """Write-only file object that hands bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def iter_parquet(rows, columns=EXPORT_COLUMNS):
+    """Yield a Parquet file one row group at a time from Transaction records (requires pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("timestamp", pa.string()),
+        ("agent_id", pa.string()),
+        ("merchant", pa.string()),
+        ("amount", pa.float64()),
+        ("amount_minor", pa.int64()),
+        ("currency", pa.string()),
+        ("item", pa.string()),
+        ("status", pa.string()),
+        ("risk_reason", pa.string()),
+    ])
+    schema = pa.schema([schema.field(c) for c in columns])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        for batch in _batches(rows):
+            # Columnar view per batch: no per-row dicts on the Parquet path
+            table = pa.Table.from_pydict(
+                {c: list(v) for c, v in columnar(batch, columns).items()}, schema=schema
+            )
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,166 @@
+"""
+Local fake of the PayPal REST endpoints AgentGuard uses, with fault injection
+(standard library only).
+
+    python src/api/fake_paypal.py --port 8766 --error-rate 0.3 --hang-rate 0.1
+    export PAYPAL_API_BASE=http://127.0.0.1:8766
+    uvicorn src.api.main:app --reload
+
+Faults apply to every request:
+- `--delay`       seconds added to every response
+- `--error-rate`  fraction of requests answered with 503
+- `--hang-rate`   fraction of requests that stall for `--hang-seconds`
+                  (longer than the client timeout, so they surface as timeouts)
+
+They can be changed while running, e.g. to "take PayPal down" mid-test:
+
+    curl -X POST localhost:8766/__faults -d '{"error_rate": 1.0}'
+    curl localhost:8766/__faults
+
+With `--webhook-url`, every capture also delivers a PAYMENT.CAPTURE.COMPLETED
+event to that URL, like a PayPal webhook subscription would. The events are
+unsigned, so start the API with PAYPAL_WEBHOOK_ALLOW_UNVERIFIED=1.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+CAPTURE_RE = re.compile(r"^/v2/checkout/orders/(?P<order_id>[^/]+)/capture$")
+
+
+class FakePayPal(BaseHTTPRequestHandler):
+    faults = {"delay": 0.0, "error_rate": 0.0, "hang_rate": 0.0, "hang_seconds": 30.0}
+    webhook_url = None
+    orders = {}       # order id -> order
+    idempotency = {}  # PayPal-Request-Id -> (status, body)
+    lock = threading.Lock()
+    rng = random.Random()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/__faults":
+            self._send(200, self.faults)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if self.path == "/__faults":
+            self.faults.update(json.loads(raw or b"{}"))
+            self._send(200, self.faults)
+            return
+
+        time.sleep(self.faults["delay"])
+        roll = self.rng.random()
+        if roll < self.faults["hang_rate"]:
+            time.sleep(self.faults["hang_seconds"])
+        elif roll < self.faults["hang_rate"] + self.faults["error_rate"]:
+            self._send(503, {"name": "SERVICE_UNAVAILABLE", "message": "Injected fault"})
+            return
+
+        request_id = self.headers.get("PayPal-Request-Id")
+        with self.lock:
+            if request_id and request_id in self.idempotency:
+                self._send(*self.idempotency[request_id])
+                return
+            status, body = self._route(raw)
+            if request_id and status < 500:
+                self.idempotency[request_id] = (status, body)
+        self._send(status, body)
+
+    def _route(self, raw):
+        if self.path == "/v1/oauth2/token":
+            return 200, {"access_token": f"FAKE-{uuid.uuid4().hex}", "token_type": "Bearer", "expires_in": 32400}
+        if self.path == "/v1/notifications/verify-webhook-signature":
+            return 200, {"verification_status": "SUCCESS"}
+        if self.path == "/v2/checkout/orders":
+            body = json.loads(raw or b"{}")
+            order_id = uuid.uuid4().hex[:17].upper()
+            self.orders[order_id] = {"id": order_id, "status": "PAYER_ACTION_REQUIRED",
+                                     "purchase_units": body.get("purchase_units", [])}
+            host = self.headers.get("Host", "127.0.0.1")
+            return 201, {**self.orders[order_id], "links": [
+                {"rel": "payer-action", "href": f"http://{host}/checkoutnow?token={order_id}"},
+            ]}
+        match = CAPTURE_RE.match(self.path)
+        if match:
+            order = self.orders.get(match["order_id"])
+            if order is None:
+                return 404, {"name": "RESOURCE_NOT_FOUND"}
+            if order["status"] == "COMPLETED":
+                return 422, {"name": "UNPROCESSABLE_ENTITY", "details": [{"issue": "ORDER_ALREADY_CAPTURED"}]}
+            order["status"] = "COMPLETED"
+            capture = {"id": f"CAP{uuid.uuid4().hex[:14].upper()}", "status": "COMPLETED"}
+            unit = order["purchase_units"][0] if order["purchase_units"] else {}
+            self._deliver_webhook(order["id"], capture["id"], unit)
+            return 201, {"id": order["id"], "status": "COMPLETED",
+                         "purchase_units": [{**unit, "payments": {"captures": [capture]}}]}
+        return 404, {"name": "NOT_FOUND"}
+
+    def _deliver_webhook(self, order_id, capture_id, unit):
+        if not self.webhook_url:
+            return
+        event = {
+            "id": f"WH-FAKE-{uuid.uuid4().hex[:12]}",
+            "event_type": "PAYMENT.CAPTURE.COMPLETED",
+            "resource": {
+                "id": capture_id, "status": "COMPLETED", "amount": unit.get("amount"),
+                "custom_id": unit.get("custom_id"),
+                "supplementary_data": {"related_ids": {"order_id": order_id}},
+            },
+        }
+
+        def send():
+            req = Request(self.webhook_url, data=json.dumps(event).encode(),
+                          headers={"Content-Type": "application/json"}, method="POST")
+            try:
+                urlopen(req, timeout=5).close()
+            except OSError:
+                pass  # PayPal would retry; the redirect path still covers it
+
+        threading.Thread(target=send, daemon=True).start()
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout) while we were hanging
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake PayPal REST API with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--webhook-url", help="e.g. http://127.0.0.1:8000/v1/paypal/webhook")
+    args = parser.parse_args(argv)
+
+    FakePayPal.faults.update(delay=args.delay, error_rate=args.error_rate,
+                             hang_rate=args.hang_rate, hang_seconds=args.hang_seconds)
+    FakePayPal.rng.seed(args.seed)
+    FakePayPal.webhook_url = args.webhook_url
+    server = ThreadingHTTPServer((args.host, args.port), FakePayPal)
+    print(f"🧪 [FAKE PAYPAL]: listening on http://{args.host}:{args.port} faults={FakePayPal.faults}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Evasion-resistant text folding and bounded fuzzy lookup for merchant screening.
+
+fold() maps the usual disguises of a word onto one canonical form:
+- Unicode compatibility forms (fullwidth, ligatures) via NFKC, then case folding
+- confusable letters (Cyrillic/Greek look-alikes) onto Latin
+- accents and other combining marks dropped
+- leetspeak digits/symbols onto letters ("sk3tchy", "$cam", "d@rk")
+- separators removed ("s-k-e-t-c-h-y", "sketchy.crypto")
+
+DeletionIndex is a SymSpell-style index: every term is stored under all the
+strings reachable by deleting up to k characters from its first PREFIX_LENGTH
+characters. A lookup generates the same deletes for the query, collects the
+candidate terms and verifies only those with a bounded edit distance. The
+lookup cost does not grow with the number of terms indexed.
+"""
+import re
+import unicodedata
+
+# Curated from Unicode TR39 confusables: letters that render like ASCII
+CONFUSABLES = {
+    # Cyrillic
+    "а": "a", "в": "b", "с": "c", "ԁ": "d", "е": "e", "ё": "e", "һ": "h", "н": "h",
+    "і": "i", "ї": "i", "ј": "j", "к": "k", "ӏ": "l", "м": "m", "о": "o", "р": "p",
+    "ԛ": "q", "ѕ": "s", "т": "t", "у": "y", "ү": "y", "х": "x", "ԝ": "w", "ь": "b",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w", "ς": "s",
+    # Latin look-alikes outside ASCII
+    "ı": "i", "ł": "l", "ø": "o", "ß": "ss", "ſ": "s", "ɑ": "a", "ɡ": "g", "ɩ": "i",
+}
+LEET = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "!": "i", "|": "l", "+": "t", "€": "e",
+}
+PREFIX_LENGTH = 7  # SymSpell prefix: bounds deletes per term (~30) for any term length
+_TRANSLATION = str.maketrans({**CONFUSABLES, **LEET})
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def _fold_chars(text):
+    text = unicodedata.normalize("NFKC", text or "").casefold().translate(_TRANSLATION)
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text.translate(_TRANSLATION)  # NFKD can expose more mapped characters
+
+
+def fold(text):
+    """Canonical form with separators removed: "S-k-3-t-c-h-ʏ.com" -> "sketchycom" """
+    return _SEPARATORS.sub("", _fold_chars(text))
+
+
+def tokens(text):
+    """
+    Folded words. Runs of single characters are joined back together, so a
+    spelled-out "s k e t c h y deals" yields "sketchy" and "deals".
+    """
+    out, run = [], []
+    for part in _SEPARATORS.split(_fold_chars(text)):
+        if len(part) == 1:
+            run.append(part)
+            continue
+        if run:
+            out.append("".join(run))
+            run = []
+        if part:
+            out.append(part)
+    if run:
+        out.append("".join(run))
+    return out
+
+
+def phrase(text):
+    """
+    Folded words joined by single spaces: "S-k-3-t-c-h-ʏ.com" -> "sketchy com".
+    A keyword substring-matched against this can match inside a word but
+    never glues two words together ("Bass Camera" does not contain "scam").
+    """
+    return " ".join(tokens(text))
+
+
+def max_edits(term):
+    """Edits tolerated for a term: short words must match exactly ("dark" vs "park")"""
+    if len(term) < 6:
+        return 0
+    return 1 if len(term) < 9 else 2
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            best = min(best, cur[j])
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def _deletes(word, depth):
+    """word plus every string reachable by deleting up to depth characters"""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+class DeletionIndex:
+    def __init__(self, terms):
+        self.terms = frozenset(t for t in terms if t)
+        self.max_depth = max((max_edits(t) for t in self.terms), default=0)
+        self._index = {}
+        for term in self.terms:
+            for key in _deletes(term[:PREFIX_LENGTH], max_edits(term)):
+                self._index.setdefault(key, set()).add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, word):
+        """Closest indexed term within that term's edit allowance, as (term, distance), or None"""
+        if word in self.terms:
+            return word, 0
+        best = None
+        seen = set()
+        for key in _deletes(word[:PREFIX_LENGTH], self.max_depth):
+            for term in self._index.get(key, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                limit = max_edits(term) if best is None else min(max_edits(term), best[1] - 1)
+                if limit < 1 or abs(len(term) - len(word)) > limit:
+                    continue
+                distance = edit_distance(word, term, limit)
+                if distance <= limit:
+                    best = (term, distance)
+        return best
@@ -0,0 +1,204 @@
+"""
+Per-currency, time-windowed budget ledger.
+
+Spend is kept in calendar buckets per window ("day", optionally "hour" and
+"week") in the configured timezone. Rollover is lazy: every read or write
+first compares the clock with the current bucket's end (one float compare)
+and only when it has passed does the bucket move into history and a fresh
+one start. No cron job, and every check stays O(1).
+
+All reads, writes and rollovers happen under one lock, so a charge can never
+land in a bucket that is being rolled over, and two requests racing across
+midnight cannot both reset (or double-count) the day.
+
+A refund is credited to the bucket its capture was charged to: refunding
+yesterday's purchase corrects yesterday's spend and adds no headroom today.
+
+Amounts are Money (integer minor units).
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, time as dtime, timedelta, timezone
+
+from src.api.money import Money
+
+WINDOWS = ("hour", "day", "week")
+WINDOW_LABELS = {"hour": "hourly", "day": "daily", "week": "weekly"}
+HISTORY_LENGTH = {"hour": 48, "day": 90, "week": 52}
+
+
+def tzinfo_for(name):
+    if name in (None, "UTC"):
+        return timezone.utc
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+
+def window_bounds(window, now, tz):
+    """(bucket key, bucket end as epoch seconds) for the bucket containing now"""
+    local = datetime.fromtimestamp(now, tz)
+    if window == "hour":
+        start = local.replace(minute=0, second=0, microsecond=0)
+        # The offset keeps the repeated hour at a DST fall-back in its own bucket
+        return start.isoformat(timespec="minutes"), start.timestamp() + 3600
+    day = local.date()
+    if window == "week":
+        day -= timedelta(days=day.weekday())
+        year, week, _ = day.isocalendar()
+        key, length = f"{year}-W{week:02d}", 7
+    else:
+        key, length = day.isoformat(), 1
+    end = datetime.combine(day + timedelta(days=length), dtime.min, tzinfo=tz)
+    return key, end.timestamp()
+
+
+class _Bucket:
+    __slots__ = ("window", "limits", "key", "ends_at", "spent", "history")
+
+    def __init__(self, window, limits):
+        self.window = window
+        self.limits = limits                  # {currency: Money}
+        self.key = None
+        self.ends_at = float("-inf")
+        self.spent = {}                       # {currency: minor units}
+        self.history = OrderedDict()          # key -> {currency: minor units}, oldest first
+
+    def roll(self, now, tz):
+        if now < self.ends_at:
+            return
+        key, self.ends_at = window_bounds(self.window, now, tz)
+        if key == self.key:  # clock moved backwards across a boundary; keep counting
+            return
+        if self.key is not None:
+            self.history[self.key] = self.spent
+            while len(self.history) > HISTORY_LENGTH[self.window]:
+                self.history.popitem(last=False)
+        self.key = key
+        self.spent = {}
+
+    def credit(self, amount, charged_at, tz):
+        """Take a refund off the bucket the charge landed in (current or history)"""
+        spent = self.spent
+        if charged_at is not None:
+            key, _ = window_bounds(self.window, charged_at, tz)
+            spent = self.spent if key == self.key else self.history.get(key)
+            if spent is None:
+                return  # that bucket has aged out of history
+        spent[amount.currency] = max(0, spent.get(amount.currency, 0) - amount.minor)
+
+
+class BudgetLedger:
+    def __init__(self, limits, opening_spend=None, window_limits=None, tz="UTC", clock=time.time):
+        """
+        limits:        {currency: Money} daily budget per currency
+        opening_spend: {currency: Money} already spent today (optional)
+        window_limits: {"hour" | "week": {currency: Money}} extra windows (optional)
+        tz:            IANA timezone name the windows roll over in
+        """
+        self._tz = tzinfo_for(tz)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._currencies = list(limits)
+        self._buckets = {"day": _Bucket("day", dict(limits))}
+        for window, window_limit in (window_limits or {}).items():
+            if window not in WINDOWS:
+                raise ValueError(f"Unknown budget window: {window}")
+            if window_limit:
+                self._buckets[window] = _Bucket(window, dict(window_limit))
+        with self._lock:
+            self._roll()
+            for bucket in self._buckets.values():
+                for currency, amount in (opening_spend or {}).items():
+                    bucket.spent[currency] = amount.minor
+
+    def _roll(self):
+        now = self._clock()
+        for bucket in self._buckets.values():
+            bucket.roll(now, self._tz)
+
+    def windows(self):
+        return [w for w in WINDOWS if w in self._buckets]
+
+    def supports(self, currency):
+        return currency in self._currencies
+
+    def spent(self, currency, window="day"):
+        with self._lock:
+            self._roll()
+            return Money(self._buckets[window].spent.get(currency, 0), currency)
+
+    def headroom(self, currency):
+        """(remaining Money, window) for the tightest window that limits this currency"""
+        with self._lock:
+            self._roll()
+            best = None
+            for bucket in self._buckets.values():
+                if currency in bucket.limits:
+                    left = bucket.limits[currency].minor - bucket.spent.get(currency, 0)
+                    if best is None or left < best[0]:
+                        best = (left, bucket.window)
+            return Money(best[0], currency), best[1]
+
+    def remaining(self, currency):
+        return self.headroom(currency)[0]
+
+    def charge(self, amount):
+        """Record captured spend in every window's current bucket; returns the charge time (epoch seconds)"""
+        with self._lock:
+            now = self._clock()
+            for bucket in self._buckets.values():
+                bucket.roll(now, self._tz)
+                bucket.spent[amount.currency] = bucket.spent.get(amount.currency, 0) + amount.minor
+            return now
+
+    def refund(self, amount, charged_at=None):
+        """
+        Credit spend back (never below zero) to the buckets that hold the
+        charge made at charged_at, or to the current buckets if it is unknown.
+        """
+        with self._lock:
+            self._roll()
+            for bucket in self._buckets.values():
+                bucket.credit(amount, charged_at, self._tz)
+
+    def reset(self):
+        """Zero the current buckets (the manual /reset); history is kept"""
+        with self._lock:
+            self._roll()
+            for bucket in self._buckets.values():
+                bucket.spent = {}
+
+    def snapshot(self):
+        with self._lock:
+            self._roll()
+            day = self._buckets["day"]
+            out = {}
+            for c in self._currencies:
+                out[c] = {
+                    "daily_budget": day.limits[c].to_float(),
+                    "spent_today": Money(day.spent.get(c, 0), c).to_float(),
+                    "remaining": Money(day.limits[c].minor - day.spent.get(c, 0), c).to_float(),
+                    "windows": {
+                        b.window: {
+                            "bucket": b.key,
+                            "limit": b.limits[c].to_float(),
+                            "spent": Money(b.spent.get(c, 0), c).to_float(),
+                            "resets_at": datetime.fromtimestamp(b.ends_at, self._tz).isoformat(),
+                        }
+                        for b in self._buckets.values() if c in b.limits
+                    },
+                }
+            return out
+
+    def history(self, window="day", limit=None):
+        """Spend per bucket, newest first, current bucket included: [{bucket, spent: {cur: float}}]"""
+        with self._lock:
+            self._roll()
+            bucket = self._buckets[window]
+            rows = [(bucket.key, bucket.spent), *reversed(bucket.history.items())]
+        rows = rows[:limit] if limit else rows
+        return [
+            {"bucket": key, "spent": {c: Money(v, c).to_float() for c, v in spent.items()}}
+            for key, spent in rows
+        ]
@@ -1,14 +1,40 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import uuid
-from datetime import datetime
 import os
 import requests
 import base64
+import copy
+import decimal
+import threading
+import time
+
+from src.api.analytics import DIMENSIONS, SpendRollups
+from src.api.approval_queue import ApprovalQueue
+from src.api.export import iter_csv, iter_parquet, parquet_available
+from src.api.ledger import WINDOW_LABELS, BudgetLedger
+from src.api.money import Money, totals_by_currency
+from src.api.records import COLUMNS, StatusIndex, Transaction, TxStatus, columnar
+from src.api.resilience import (Bulkhead, BulkheadFullError, CircuitBreaker, CircuitOpenError,
+                                ResilientClient, UpstreamError)
+from src.api.rules import DecisionCache, RuleSet, decide
+from src.api.shadow import ShadowEvaluator
+from src.api.webhooks import PermanentError, WebhookQueue, WorkerPool
+
+@asynccontextmanager
+async def lifespan(app):
+    webhook_workers.start()
+    shadow.start()
+    yield
+    shadow.stop()
+    webhook_workers.stop()
 
-app = FastAPI(title="AgentGuard Risk Engine")
+app = FastAPI(title="AgentGuard Risk Engine", lifespan=lifespan)
 
 # --- CORS CONFIGURATION ---
 app.add_middleware(
@@ -21,33 +47,116 @@ app.add_middleware(
 
 # --- SIMULATED DATABASE (In-Memory) ---
 # In a real app, this would be PostgreSQL
-transactions_db = []
+transactions_db = []        # Transaction records, append-ordered
+transactions_by_id = {}     # id -> Transaction (O(1) lookups)
+transactions_by_order = {}  # PayPal order id -> Transaction (webhook lookups)
+status_index = StatusIndex()  # status -> Transactions in log order (filtered pages)
+applied_refunds = set()     # PayPal refund ids already credited back
+refunded_totals = {}        # tx id -> Money refunded so far (capped at the captured amount)
+db_lock = threading.Lock()  # Guards multi-row status changes (bulk decisions)
+decision_cache = DecisionCache()  # Memoized blocklist/keyword classification
 
 # User Configuration (The "Rules")
 USER_CONFIG = {
+    "currency": "USD",         # Budget currency for the limits below
+    "timezone": os.getenv("BUDGET_TIMEZONE", "UTC"),  # Budgets roll over at local midnight
     "daily_budget": 10000.00,  # $10,000 daily budget
-    "spent_today": 1000.00,    # Already spent $1,000
+    "hourly_budget": None,     # Optional extra windows (None = no limit)
+    "weekly_budget": None,
     "require_approval_over": 5000.00,  # Anything > $5,000 needs human approval
-    "blocked_merchants": ["sketchy-crypto.com", "unknown-seller.net"]
+    "blocked_merchants": ["sketchy-crypto.com", "unknown-seller.net"],
+    # Separate limits for purchases in other currencies (no FX conversion)
+    "currency_limits": {
+        "EUR": {"daily_budget": 9000.00, "require_approval_over": 4500.00},
+    },
 }
 
+def _limits(key, config=USER_CONFIG):
+    configs = {config["currency"]: config, **config["currency_limits"]}
+    return {c: Money.of(cfg[key], c) for c, cfg in configs.items() if cfg.get(key) is not None}
+
+# The budget ledger owns "spent today" (integer minor units per currency,
+# per calendar window, rolling over lazily in USER_CONFIG["timezone"])
+ledger = BudgetLedger(
+    limits=_limits("daily_budget"),
+    opening_spend={"USD": Money.of("1000.00", "USD")},  # Already spent $1,000
+    window_limits={"hour": _limits("hourly_budget"), "week": _limits("weekly_budget")},
+    tz=USER_CONFIG["timezone"],
+)
+APPROVAL_THRESHOLDS = _limits("require_approval_over")
+# PENDING_APPROVAL items, most urgent first (amounts ranked against each currency's budget)
+approval_queue = ApprovalQueue(budgets=_limits("daily_budget"))
+analytics = SpendRollups(tz=USER_CONFIG["timezone"])  # Incremental spend/approval rollups
+shadow = ShadowEvaluator(APPROVAL_THRESHOLDS, queue_size=int(os.getenv("SHADOW_QUEUE_SIZE", "1000")))  # Candidate rule sets, evaluated off the response path
+
+def _set_status(tx, status):
+    """Every stored status change goes through here so the rollups stay in step"""
+    old_status = tx.status
+    tx.status = TxStatus(status)
+    status_index.move(tx, old_status, tx.status)
+    analytics.record_transition(tx, old_status, tx.status)
+
+def current_config():
+    """USER_CONFIG plus live budget figures (base currency at the top level)"""
+    base = USER_CONFIG["currency"]
+    return {
+        **USER_CONFIG,
+        "spent_today": ledger.spent(base).to_float(),
+        "budgets": ledger.snapshot(),
+    }
+
 # --- DATA MODELS ---
 class PaymentRequest(BaseModel):
     agent_id: str
     merchant_name: str
     amount: float
     item_description: str
+    currency: str = "USD"
 
 class TransactionResponse(BaseModel):
     transaction_id: str
     status: str  # APPROVED, DENIED, PENDING_APPROVAL
     message: str
     amount: Optional[float] = None
+    currency: Optional[str] = None
+    # Same field names as the stored record, so clients never remap fields
+    id: Optional[str] = None
+    merchant: Optional[str] = None
+    item: Optional[str] = None
+    risk_reason: Optional[str] = None
+    timestamp: Optional[str] = None
+
+class TransactionRecord(BaseModel):
+    id: str
+    timestamp: str
+    agent_id: str = ""
+    merchant: str
+    amount: float
+    currency: str = "USD"
+    item: str
+    status: TxStatus
+    risk_reason: str = ""
+    paypal_order_id: Optional[str] = None
+    paypal_capture_id: Optional[str] = None
+
+class BatchPaymentRequest(BaseModel):
+    payments: List[PaymentRequest]
 
 class ApprovalRequest(BaseModel):
     transaction_id: str
     decision: str # APPROVE or DENY
 
+class BulkApprovalRequest(BaseModel):
+    decision: str # APPROVE or DENY
+    # Either an explicit list of ids...
+    transaction_ids: Optional[List[str]] = None
+    # ...or a filter over the pending queue (all given fields must match)
+    merchant: Optional[str] = None
+    risk_reason: Optional[str] = None
+    currency: Optional[str] = None  # required with min_amount / max_amount
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+
 # --- ENDPOINTS ---
 
 @app.get("/")
@@ -57,14 +166,100 @@ def read_root():
 @app.get("/config")
 def get_config():
     """Return current budget status for the Dashboard"""
-    return USER_CONFIG
+    return current_config()
+
+@app.get("/v1/admin/rules/cache")
+def get_decision_cache_stats():
+    """Hit/miss counters for the classification cache"""
+    return decision_cache.stats()
+
+# --- SHADOW RULES ---
+SHADOW_LIST_KEYS = {"blocked_merchants", "suspicious_item_keywords", "suspicious_merchant_keywords"}
+SHADOW_CONFIG_KEYS = SHADOW_LIST_KEYS | {"require_approval_over", "currency_limits"}
+
+class ShadowCandidateRequest(BaseModel):
+    name: str
+    config: dict  # overrides on top of the current USER_CONFIG (SHADOW_CONFIG_KEYS only)
+
+class ShadowReplayRequest(BaseModel):
+    config: dict
+    limit: Optional[int] = None  # newest N recorded requests (default: all retained)
+
+def _shadow_snapshot(overrides):
+    unknown = set(overrides) - SHADOW_CONFIG_KEYS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported shadow config keys: {sorted(unknown)}")
+    for key in SHADOW_LIST_KEYS & set(overrides):
+        if not isinstance(overrides[key], list) or not all(isinstance(v, str) for v in overrides[key]):
+            raise HTTPException(status_code=400, detail=f"{key} must be a list of strings")
+    config = copy.deepcopy({**USER_CONFIG, **overrides})
+    try:
+        RuleSet.from_config(config)  # fail here, not later in the shadow worker
+        return config, _limits("require_approval_over", config)
+    except (ValueError, TypeError, KeyError, AttributeError, decimal.InvalidOperation) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid shadow config: {e}")
+
+@app.get("/v1/admin/shadow")
+def get_shadow_stats():
+    """Queue health plus agreement stats / recent disagreements per candidate"""
+    return shadow.stats()
+
+@app.post("/v1/admin/shadow/candidates")
+def add_shadow_candidate(req: ShadowCandidateRequest):
+    """Start shadowing live traffic with a rule snapshot (replaces one with the same name)"""
+    config, thresholds = _shadow_snapshot(req.config)
+    shadow.add_candidate(req.name, config, thresholds)
+    return {"status": "shadowing", "name": req.name}
+
+@app.delete("/v1/admin/shadow/candidates/{name}")
+def remove_shadow_candidate(name: str):
+    if not shadow.remove_candidate(name):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"status": "removed", "name": name}
+
+@app.post("/v1/admin/shadow/replay")
+def replay_shadow_rules(req: ShadowReplayRequest):
+    """Evaluate a rule snapshot against recorded requests, synchronously and deterministically"""
+    config, thresholds = _shadow_snapshot(req.config)
+    return shadow.replay("replay", config, thresholds, req.limit)
+
+@app.get("/v1/admin/analytics")
+def get_analytics_summary():
+    """Approval rates and time-to-approve percentiles (precomputed)"""
+    return analytics.summary()
+
+@app.get("/v1/admin/analytics/{dimension}")
+def get_analytics_breakdown(dimension: str, top: int = 20, sort: str = "spend", currency: Optional[str] = None):
+    """Spend and counts per merchant | agent | status | hour, read from the rollups"""
+    if dimension not in DIMENSIONS:
+        raise HTTPException(status_code=400, detail=f"dimension must be one of {list(DIMENSIONS)}")
+    return {
+        "dimension": dimension,
+        "rows": analytics.breakdown(dimension, top=top, sort=sort, currency=currency or USER_CONFIG["currency"]),
+    }
+
+@app.get("/v1/admin/budget/history")
+def get_budget_history(window: str = "day", limit: int = 30):
+    """Spend per calendar bucket (newest first, current bucket included)"""
+    if window not in ledger.windows():
+        raise HTTPException(status_code=400, detail=f"window must be one of {ledger.windows()}")
+    return {"window": window, "timezone": USER_CONFIG["timezone"], "buckets": ledger.history(window, limit)}
 
 @app.post("/reset")
 def reset_state():
     """Reset the backend state (budget and transactions)"""
-    global transactions_db
-    USER_CONFIG["spent_today"] = 0.0
-    transactions_db = []
+    ledger.reset()
+    with db_lock:
+        transactions_db.clear()
+        status_index.clear()
+        transactions_by_id.clear()
+        transactions_by_order.clear()
+        applied_refunds.clear()
+        refunded_totals.clear()
+    approval_queue.clear()
+    webhook_queue.clear()
+    analytics.reset()
+    shadow.clear()
     return {"status": "State reset successfully"}
 
 @app.post("/v1/agent/pay", response_model=TransactionResponse)
@@ -74,46 +269,44 @@ def process_payment(req: PaymentRequest):
     """
     tx_id = str(uuid.uuid4())[:8]
     
-    # 1. Check Blocked Merchants (Compliance Rule)
-    if req.merchant_name in USER_CONFIG["blocked_merchants"]:
-        return {
-            "transaction_id": tx_id, 
-            "status": "DENIED", 
-            "message": "Merchant is on the Blocklist"
-        }
+    # Keyword/blocklist classification is pure given the rules -> memoized
+    classification = decision_cache.classify(USER_CONFIG, req.merchant_name, req.item_description)
 
-    # 2. Check Budget (Financial Health Rule)
-    remaining_budget = USER_CONFIG["daily_budget"] - USER_CONFIG["spent_today"]
-    if req.amount > remaining_budget:
+    def denied(message, amount=None):
+        if amount is not None:
+            analytics.record_new(req.merchant_name, req.agent_id, amount, time.time(), "DENIED")
         return {
             "transaction_id": tx_id, 
+            "id": tx_id,
             "status": "DENIED", 
-            "message": f"Exceeds daily budget. Remaining: ${remaining_budget}"
+            "message": message,
+            "amount": req.amount,
+            "currency": req.currency,
+            "merchant": req.merchant_name,
+            "item": req.item_description,
         }
 
-    # 3. Risk Analysis (The 'Brain')
-    # Logic: Check amount, item, AND merchant for suspicious patterns
-    requires_approval = False
-    risk_reason = ""
-
-    if req.amount > USER_CONFIG["require_approval_over"]:
-        requires_approval = True
-        risk_reason = "Amount exceeds auto-approval limit"
-
-    # Check for suspicious ITEM keywords
-    suspicious_item_keywords = ["crypto", "gift card", "casino", "mystery", "hacked", "stolen"]
-    if any(word in req.item_description.lower() for word in suspicious_item_keywords):
-        requires_approval = True
-        risk_reason = "High-risk item category detected"
-
-    # Check for suspicious MERCHANT keywords (SECURITY FIX)
-    suspicious_merchant_keywords = [
-        "scam", "scammy", "sketchy", "dark", "darkweb", "hack", "illegal",
-        "fraud", "suspicious", "unknown", "untrusted", "shady", "fake"
-    ]
-    if any(word in req.merchant_name.lower() for word in suspicious_merchant_keywords):
-        requires_approval = True
-        risk_reason = "Suspicious merchant detected"
+    # 0. Parse the amount once into exact minor units
+    try:
+        amount = Money.of(req.amount, req.currency)
+    except ValueError as e:  # unknown currency, or not a finite amount
+        return denied(str(e))
+    if not ledger.supports(amount.currency):
+        return denied(f"No budget configured for {amount.currency}")
+
+    # 1-3. Blocklist, budget (stateful, read every time) and risk rules -> see rules.decide
+    remaining_budget, window = ledger.headroom(amount.currency)
+    decision = decide(classification, amount, remaining_budget, APPROVAL_THRESHOLDS[amount.currency])
+    # Same inputs to the shadow rule sets; never blocks (drops under overload)
+    shadow.submit(tx_id, req.merchant_name, req.item_description, amount, remaining_budget, decision)
+
+    if decision.denied_by == "blocklist":
+        return denied("Merchant is on the Blocklist", amount)
+    if decision.denied_by == "budget":
+        return denied(f"Exceeds {WINDOW_LABELS[window]} budget. Remaining: {remaining_budget}", amount)
+
+    risk_reason = decision.risk_reason
+    requires_approval = bool(risk_reason)
 
     # 4. Final Decision
     if requires_approval:
@@ -125,28 +318,201 @@ def process_payment(req: PaymentRequest):
         # Do NOT deduct money yet. Wait for capture.
 
     # Save to DB
-    tx_record = {
-        "id": tx_id,
-        "timestamp": datetime.now().isoformat(),
-        "merchant": req.merchant_name,
-        "amount": req.amount,
-        "item": req.item_description,
-        "status": status,
-        "risk_reason": risk_reason
-    }
+    tx_record = Transaction(
+        id=tx_id,
+        agent_id=req.agent_id,
+        merchant=req.merchant_name,
+        item=req.item_description,
+        money=amount,
+        status=status,
+        risk_reason=risk_reason,
+    )
     transactions_db.append(tx_record)
+    transactions_by_id[tx_id] = tx_record
+    status_index.add(tx_record)
+    analytics.record_new(tx_record.merchant, tx_record.agent_id, amount, tx_record.created_at, status)
+    if status == "PENDING_APPROVAL":
+        approval_queue.push(tx_record)
 
     return {
         "transaction_id": tx_id,
+        "id": tx_id,
         "status": status,
         "message": message,
-        "amount": req.amount
+        "amount": tx_record.amount,
+        "currency": tx_record.currency,
+        "merchant": tx_record.merchant,
+        "item": tx_record.item,
+        "risk_reason": tx_record.risk_reason,
+        "timestamp": tx_record.timestamp,
     }
 
+MAX_BATCH_PAYMENTS = 50
+
+@app.post("/v1/agent/pay/batch", response_model=List[TransactionResponse])
+def process_payment_batch(req: BatchPaymentRequest):
+    """
+    Authorize a whole cart in one round trip.
+    Each item gets exactly the decision /v1/agent/pay would give it; results
+    come back in request order.
+    """
+    if len(req.payments) > MAX_BATCH_PAYMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PAYMENTS} payments per batch")
+    return [process_payment(p) for p in req.payments]
+
 @app.get("/v1/admin/transactions")
 def get_transactions():
     """Used by the Dashboard to show history"""
-    return transactions_db
+    return [t.to_dict() for t in transactions_db]
+
+@app.get("/v1/admin/transactions/columns")
+def get_transaction_columns(fields: Optional[str] = None):
+    """Column-oriented view for analytics: {column: [values...]}"""
+    columns = fields.split(",") if fields else ["id", "timestamp", "merchant", "amount_minor", "currency", "status", "risk_reason"]
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns {unknown}; choose from {list(COLUMNS)}")
+    data = columnar(list(transactions_db), columns)
+    return {c: list(v) for c, v in data.items()}
+
+@app.get("/v1/admin/transactions/totals")
+def get_transaction_totals(status: Optional[str] = None):
+    """Exact per-currency totals, summed over integer minor units"""
+    rows = status_index.records(status) if status else list(transactions_db)
+    data = columnar(rows, ("amount_minor", "currency"))
+    totals = totals_by_currency(data["amount_minor"], data["currency"])
+    return {
+        "count": len(rows),
+        "totals": {c: {"amount": m.to_float(), "amount_minor": m.minor} for c, m in totals.items()},
+    }
+
+# Precomputed display category per status, so clients never style per cell
+STATUS_CATEGORIES = {
+    "APPROVED": "approved",
+    "COMPLETED": "approved",
+    "DENIED": "denied",
+    "PENDING_APPROVAL": "pending",
+    "REFUNDED": "other",
+}
+# Only orders an index already serves: log order, or the per-status index
+# (statuses in order, newest first within each). Either is O(limit) per page.
+SORTABLE_FIELDS = {"timestamp", "status"}
+
+def _log_row(tx):
+    row = tx.to_dict()
+    row["status_category"] = STATUS_CATEGORIES.get(tx.status, "other")
+    return row
+
+def _status_ordered_page(statuses, offset, limit):
+    """offset/limit over the given statuses' lists laid end to end, newest first within each"""
+    page = []
+    for s in statuses:
+        count = status_index.count(s)
+        if offset >= count:
+            offset -= count
+            continue
+        end = count - offset
+        take = min(limit - len(page), end)
+        page += status_index.page(s, end - take, end)[::-1]
+        offset = 0
+        if len(page) >= limit:
+            break
+    return page
+
+@app.get("/v1/admin/transactions/page")
+def get_transactions_page(offset: int = 0, limit: int = 50, sort_by: str = "timestamp",
+                          descending: bool = True, status: Optional[str] = None):
+    """
+    Server-side paged + sorted view of the transaction log.
+    The default (newest first) is a plain slice of the append-ordered log, or
+    of the per-status index when filtering by status; sort_by=status walks
+    the per-status lists in status order. No request scans the whole log.
+    """
+    if sort_by not in SORTABLE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {sorted(SORTABLE_FIELDS)}")
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), 500)
+
+    if sort_by == "status":
+        statuses = [status] if status else sorted(TxStatus, key=str, reverse=descending)
+        total = sum(status_index.count(s) for s in statuses)
+        page = _status_ordered_page(statuses, offset, limit)
+    else:
+        if status:
+            total = status_index.count(status)
+            window = lambda start, stop: status_index.page(status, start, stop)
+        else:
+            total = len(transactions_db)
+            window = lambda start, stop: transactions_db[start:stop]
+        if descending:
+            end = total - offset
+            page = window(max(end - limit, 0), max(end, 0))[::-1]
+        else:
+            page = window(offset, offset + limit)
+
+    return {
+        "items": [_log_row(t) for t in page],
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+    }
+
+@app.get("/v1/admin/transactions/export")
+def export_transactions(format: str = "csv", status: Optional[str] = None):
+    """Stream the full transaction log as CSV or Parquet"""
+    rows = status_index.records(status) if status else list(transactions_db)
+    if format == "csv":
+        return StreamingResponse(
+            iter_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=transactions.csv"},
+        )
+    if format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        return StreamingResponse(
+            iter_parquet(rows),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": "attachment; filename=transactions.parquet"},
+        )
+    raise HTTPException(status_code=400, detail="format must be 'csv' or 'parquet'")
+
+@app.get("/v1/admin/transactions/{transaction_id}", response_model=TransactionRecord,
+         response_model_exclude_none=True)
+def get_transaction(transaction_id: str):
+    """Single transaction lookup (receipt pages, status checks)"""
+    tx = transactions_by_id.get(transaction_id)
+    if not tx:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return tx.to_dict()
+
+DASHBOARD_BREAKDOWNS = {"merchant": 10, "agent": 10, "hour": 24}  # dimension -> rows shown
+
+@app.get("/v1/admin/dashboard")
+def get_dashboard_snapshot(recent_limit: int = 50, pending_limit: int = 100):
+    """
+    Everything the Dashboard needs for one render, in a single round trip:
+    budget config, the most urgent pending approvals, the most recent history
+    and the analytics panels (all read from precomputed rollups).
+    """
+    recent = [t.to_dict() for t in transactions_db[-recent_limit:][::-1]] if recent_limit > 0 else []
+    return {
+        "config": current_config(),
+        "pending": approval_queue.top(pending_limit),
+        "pending_count": len(approval_queue),
+        "recent": recent,
+        "total_transactions": len(transactions_db),
+        "analytics": {
+            "summary": analytics.summary(),
+            **{d: analytics.breakdown(d, top=top, currency=USER_CONFIG["currency"])
+               for d, top in DASHBOARD_BREAKDOWNS.items()},
+        },
+    }
+
+@app.get("/v1/admin/queue")
+def get_approval_queue(k: int = 20):
+    """Top-k pending approvals ordered by priority (amount, risk severity, age)"""
+    return {"items": approval_queue.top(max(k, 0)), "total": len(approval_queue)}
 
 @app.post("/v1/admin/approve")
 def approve_transaction(req: ApprovalRequest):
@@ -154,18 +520,95 @@ def approve_transaction(req: ApprovalRequest):
     Human-in-the-Loop Endpoint.
     The Dashboard calls this when the user clicks 'Approve'.
     """
-    for tx in transactions_db:
-        if tx["id"] == req.transaction_id:
+    with db_lock:
+        tx = transactions_by_id.get(req.transaction_id)
+        if tx:
+            # Same rule as the bulk path: only pending items can be decided
+            # (re-approving a COMPLETED one would let it be captured twice)
+            if tx.status != TxStatus.PENDING_APPROVAL:
+                raise HTTPException(status_code=409, detail=f"Transaction not pending: {tx.status}")
+            approval_queue.remove(tx.id)
             if req.decision == "APPROVE":
-                tx["status"] = "APPROVED"
+                _set_status(tx, TxStatus.APPROVED)
                 # Do NOT deduct money yet. Wait for capture.
                 return {"status": "updated", "new_status": "APPROVED"}
             else:
-                tx["status"] = "DENIED"
+                _set_status(tx, TxStatus.DENIED)
                 return {"status": "updated", "new_status": "DENIED"}
-    
+
     raise HTTPException(status_code=404, detail="Transaction not found")
 
+def _bulk_filter(req: BulkApprovalRequest):
+    """Predicate for the bulk filter; amount bounds are parsed once, in the requested currency"""
+    has_bounds = req.min_amount is not None or req.max_amount is not None
+    if has_bounds and not req.currency:
+        raise HTTPException(status_code=400, detail="currency is required with min_amount/max_amount")
+    try:
+        low = Money.of(req.min_amount, req.currency) if req.min_amount is not None else None
+        high = Money.of(req.max_amount, req.currency) if req.max_amount is not None else None
+        currency = req.currency.upper() if req.currency else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def matches(tx):
+        if req.merchant is not None and tx.merchant != req.merchant:
+            return False
+        if req.risk_reason is not None and tx.risk_reason != req.risk_reason:
+            return False
+        if currency is not None and tx.currency != currency:
+            return False
+        if low is not None and tx.money < low:
+            return False
+        if high is not None and tx.money > high:
+            return False
+        return True
+    return matches
+
+@app.post("/v1/admin/approve/bulk")
+def bulk_approve_transactions(req: BulkApprovalRequest):
+    """
+    Apply one decision to many pending transactions in a single request.
+    All-or-nothing: if any listed id is unknown or no longer pending,
+    nothing is changed.
+    """
+    if req.decision not in ("APPROVE", "DENY"):
+        raise HTTPException(status_code=400, detail="decision must be APPROVE or DENY")
+    has_filter = any(v is not None for v in (req.merchant, req.risk_reason, req.currency, req.min_amount, req.max_amount))
+    if req.transaction_ids is None and not has_filter:
+        raise HTTPException(status_code=400, detail="Provide transaction_ids or at least one filter")
+    matches = _bulk_filter(req)
+
+    new_status = "APPROVED" if req.decision == "APPROVE" else "DENIED"
+    with db_lock:
+        if req.transaction_ids is not None:
+            wanted = set(req.transaction_ids)
+            targets = [transactions_by_id[i] for i in wanted if i in transactions_by_id]
+            missing = wanted - {tx.id for tx in targets}
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Transactions not found: {sorted(missing)}")
+            not_pending = [tx.id for tx in targets if tx.status != TxStatus.PENDING_APPROVAL]
+            if not_pending:
+                raise HTTPException(status_code=409, detail=f"Transactions not pending: {not_pending}")
+            targets = [tx for tx in targets if matches(tx)]
+        else:
+            # Only pending items can match: scan the approval queue, not the whole log
+            targets = [
+                tx for tx in approval_queue.pending()
+                if tx.status == TxStatus.PENDING_APPROVAL and matches(tx)
+            ]
+
+        for tx in targets:
+            _set_status(tx, new_status)
+            approval_queue.remove(tx.id)
+            # Approvals still wait for capture before touching the budget.
+
+    return {
+        "status": "updated",
+        "new_status": new_status,
+        "count": len(targets),
+        "transaction_ids": [tx.id for tx in targets],
+    }
+
 class CompletePaymentRequest(BaseModel):
     transaction_id: str
     paypal_order_id: str
@@ -175,14 +618,17 @@ def complete_payment(req: CompletePaymentRequest):
     """
     Called by the Dashboard after a successful PayPal transaction.
     """
-    for tx in transactions_db:
-        if tx["id"] == req.transaction_id:
-            if tx["status"] != "APPROVED":
-                 raise HTTPException(status_code=400, detail="Transaction must be APPROVED before payment")
-            
-            tx["status"] = "COMPLETED"
-            tx["paypal_order_id"] = req.paypal_order_id
-            return {"status": "updated", "new_status": "COMPLETED"}
+    tx = transactions_by_id.get(req.transaction_id)
+    if tx:
+        if tx.status != TxStatus.APPROVED:
+             raise HTTPException(status_code=400, detail="Transaction must be APPROVED before payment")
+        
+        # Same path as a PayPal capture, so the budget is charged exactly once
+        try:
+            _mark_captured(tx, req.paypal_order_id, None)
+        except PermanentError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"status": "updated", "new_status": "COMPLETED"}
     
     raise HTTPException(status_code=404, detail="Transaction not found")
 
@@ -190,7 +636,7 @@ def complete_payment(req: CompletePaymentRequest):
 
 PAYPAL_CLIENT_ID = os.getenv("PAYPAL_CLIENT_ID")
 PAYPAL_SECRET = os.getenv("PAYPAL_SECRET")
-PAYPAL_API_BASE = "https://api-m.sandbox.paypal.com"
+PAYPAL_API_BASE = os.getenv("PAYPAL_API_BASE", "https://api-m.sandbox.paypal.com")
 
 class CreatePayPalOrderRequest(BaseModel):
     transaction_id: str
@@ -200,53 +646,62 @@ class CreatePayPalOrderRequest(BaseModel):
 class CapturePayPalOrderRequest(BaseModel):
     order_id: str
     transaction_id: str
+    wait: bool = True  # False: hand off to the webhook workers and return immediately
+
+# Resilience: PayPal calls run in their own bounded pool (bulkhead) behind a
+# circuit breaker, with per-call timeouts; retries only for idempotent calls.
+paypal_breaker = CircuitBreaker("paypal", failure_rate=0.5, window=20, min_calls=5, open_seconds=30.0)
+paypal_client = ResilientClient("paypal", timeout=(3.05, 10.0), retries=2, breaker=paypal_breaker)
+paypal_bulkhead = Bulkhead("paypal", max_concurrent=int(os.getenv("PAYPAL_MAX_CONCURRENCY", "8")), max_queued=8)
+
+_paypal_token = {"value": None, "expires_at": 0.0}
+_paypal_token_lock = threading.Lock()
 
 def get_paypal_access_token():
-    """Get PayPal OAuth access token"""
-    auth = base64.b64encode(f"{PAYPAL_CLIENT_ID}:{PAYPAL_SECRET}".encode()).decode()
-    headers = {
-        "Authorization": f"Basic {auth}",
-        "Content-Type": "application/x-www-form-urlencoded"
-    }
-    data = {"grant_type": "client_credentials"}
-    response = requests.post(f"{PAYPAL_API_BASE}/v1/oauth2/token", headers=headers, data=data)
-    if response.status_code == 200:
-        return response.json()["access_token"]
+    """Get PayPal OAuth access token (cached until shortly before it expires)"""
+    with _paypal_token_lock:  # one refresh at a time; the rest reuse its result
+        if _paypal_token["value"] and time.time() < _paypal_token["expires_at"]:
+            return _paypal_token["value"]
+        auth = base64.b64encode(f"{PAYPAL_CLIENT_ID}:{PAYPAL_SECRET}".encode()).decode()
+        headers = {
+            "Authorization": f"Basic {auth}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        data = {"grant_type": "client_credentials"}
+        response = paypal_client.post(f"{PAYPAL_API_BASE}/v1/oauth2/token", idempotent=True,
+                                      headers=headers, data=data, timeout=(3.05, 5.0))
+        if response.status_code == 200:
+            token = response.json()
+            _paypal_token["value"] = token["access_token"]
+            _paypal_token["expires_at"] = time.time() + token.get("expires_in", 300) - 60
+            return _paypal_token["value"]
     raise HTTPException(status_code=500, detail="Failed to get PayPal access token")
 
-@app.post("/v1/paypal/create-order")
-def create_paypal_order(req: CreatePayPalOrderRequest):
-    """
-    Create a PayPal order and return the approval URL for redirect
-    """
-    # Verify transaction exists and is approved
-    tx = next((t for t in transactions_db if t["id"] == req.transaction_id), None)
-    if not tx:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    if tx["status"] != "APPROVED":
-        raise HTTPException(status_code=400, detail="Transaction must be APPROVED before payment")
-    
-    access_token = get_paypal_access_token()
-    
-    headers = {
+def _paypal_headers(request_id):
+    return {
         "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}"
+        "Authorization": f"Bearer {get_paypal_access_token()}",
+        # PayPal dedupes on this header, which is what makes retrying these POSTs safe
+        "PayPal-Request-Id": request_id,
     }
-    
+
+def _create_order(tx, return_url):
+    """Create the PayPal order for an approved transaction; returns PayPal's order payload"""
     payload = {
         "intent": "CAPTURE",
         "purchase_units": [{
             "amount": {
-                "currency_code": "USD",
-                "value": f"{req.amount:.2f}"
+                "currency_code": tx.currency,
+                "value": tx.money.value_str()
             },
-            "description": tx.get("item_description", "Purchase")
+            "description": tx.item or "Purchase",
+            "custom_id": tx.id,  # echoed back in webhook events
         }],
         "payment_source": {
             "paypal": {
                 "experience_context": {
-                    "return_url": f"{req.return_url}?tx={req.transaction_id}",
-                    "cancel_url": f"{req.return_url}?cancelled=true&tx={req.transaction_id}",
+                    "return_url": f"{return_url}?tx={tx.id}",
+                    "cancel_url": f"{return_url}?cancelled=true&tx={tx.id}",
                     "user_action": "PAY_NOW",
                     "brand_name": "AgentGuard"
                 }
@@ -254,60 +709,274 @@ def create_paypal_order(req: CreatePayPalOrderRequest):
         }
     }
     
-    response = requests.post(f"{PAYPAL_API_BASE}/v2/checkout/orders", json=payload, headers=headers)
-    
+    response = paypal_client.post(f"{PAYPAL_API_BASE}/v2/checkout/orders", idempotent=True,
+                                  json=payload, headers=_paypal_headers(f"agentguard-order-{tx.id}"))
     if response.status_code in [200, 201]:
-        order_data = response.json()
-        # Find the approval URL
-        approval_url = next(
-            (link["href"] for link in order_data.get("links", []) if link["rel"] == "payer-action"),
-            None
-        )
-        return {
-            "order_id": order_data["id"],
-            "approval_url": approval_url,
-            "status": "created"
-        }
-    else:
-        raise HTTPException(status_code=500, detail=f"PayPal API error: {response.text}")
+        return response.json()
+    raise HTTPException(status_code=500, detail=f"PayPal API error: {response.text}")
 
-@app.post("/v1/paypal/capture-order")
-def capture_paypal_order(req: CapturePayPalOrderRequest):
+@app.post("/v1/paypal/create-order")
+async def create_paypal_order(req: CreatePayPalOrderRequest):
     """
-    Capture a PayPal order after user approval
+    Create a PayPal order and return the approval URL for redirect
     """
-    # Verify transaction exists
-    tx = next((t for t in transactions_db if t["id"] == req.transaction_id), None)
+    # Verify transaction exists and is approved
+    tx = transactions_by_id.get(req.transaction_id)
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
+    if tx.status != TxStatus.APPROVED:
+        raise HTTPException(status_code=400, detail="Transaction must be APPROVED before payment")
+    # Charge the amount we approved, not whatever the client sends back
+    try:
+        requested = Money.of(req.amount, tx.currency)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if requested != tx.money:
+        raise HTTPException(status_code=400, detail=f"Amount does not match approved transaction ({tx.money})")
     
-    access_token = get_paypal_access_token()
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}"
+    order_data = await paypal_bulkhead.run(_create_order, tx, req.return_url)
+    tx.paypal_order_id = order_data["id"]
+    transactions_by_order[order_data["id"]] = tx
+    # Find the approval URL
+    approval_url = next(
+        (link["href"] for link in order_data.get("links", []) if link["rel"] == "payer-action"),
+        None
+    )
+    return {
+        "order_id": order_data["id"],
+        "approval_url": approval_url,
+        "status": "created"
     }
-    
-    response = requests.post(
-        f"{PAYPAL_API_BASE}/v2/checkout/orders/{req.order_id}/capture",
-        headers=headers
+
+def _capture_order(order_id):
+    """Capture an approved PayPal order; returns PayPal's capture payload"""
+    response = paypal_client.post(
+        f"{PAYPAL_API_BASE}/v2/checkout/orders/{order_id}/capture",
+        idempotent=True,
+        headers=_paypal_headers(f"agentguard-capture-{order_id}"),
     )
-    
     if response.status_code == 201:
-        capture_data = response.json()
-        # Update transaction status
-        tx["status"] = "COMPLETED"
-        tx["paypal_order_id"] = req.order_id
-        tx["paypal_capture_id"] = capture_data.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("id")
-        
+        return response.json()
+    raise HTTPException(status_code=500, detail=f"PayPal capture failed: {response.text}")
+
+def _mark_captured(tx, order_id, capture_id):
+    """
+    APPROVED -> COMPLETED + charge the budget exactly once, whichever path
+    (redirect, webhook, replay) reports the capture first. Returns False if
+    already done; any other status is refused.
+    """
+    with db_lock:
+        if tx.status in (TxStatus.COMPLETED, TxStatus.REFUNDED):
+            return False
+        if tx.status != TxStatus.APPROVED:
+            raise PermanentError(f"Transaction {tx.id} is {tx.status}, not APPROVED")
+        _set_status(tx, TxStatus.COMPLETED)
+        tx.paypal_order_id = order_id
+        tx.paypal_capture_id = capture_id
+        transactions_by_order[order_id] = tx
         # Deduct money NOW that we have the money
-        USER_CONFIG["spent_today"] += tx["amount"]
-        
+        tx.captured_at = ledger.charge(tx.money)
+        return True
+
+@app.post("/v1/paypal/capture-order")
+async def capture_paypal_order(req: CapturePayPalOrderRequest):
+    """
+    Capture a PayPal order after user approval.
+    wait=False queues the capture for the webhook workers and returns at once.
+    """
+    # Verify transaction exists
+    tx = transactions_by_id.get(req.transaction_id)
+    if not tx:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    if tx.status not in (TxStatus.APPROVED, TxStatus.COMPLETED):
+        raise HTTPException(status_code=400, detail="Transaction must be APPROVED before capture")
+    
+    if not req.wait:
+        # Same shape as PayPal's CHECKOUT.ORDER.APPROVED, keyed so page reloads dedupe
+        event = {
+            "id": f"local-capture-{req.order_id}",
+            "event_type": "CHECKOUT.ORDER.APPROVED",
+            "resource": {"id": req.order_id, "purchase_units": [{"custom_id": tx.id}]},
+        }
+        queued = webhook_queue.enqueue(event["id"], event["event_type"], event, headers={"source": "local"})
+        webhook_workers.notify()
         return {
-            "status": "completed",
+            "status": "queued" if queued else "duplicate",
             "transaction_id": req.transaction_id,
             "paypal_order_id": req.order_id,
-            "capture_data": capture_data
         }
-    else:
-        raise HTTPException(status_code=500, detail=f"PayPal capture failed: {response.text}")
\ No newline at end of file
+    
+    capture_data = await paypal_bulkhead.run(_capture_order, req.order_id)
+    capture_id = capture_data.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("id")
+    _mark_captured(tx, req.order_id, capture_id)
+    
+    return {
+        "status": "completed",
+        "transaction_id": req.transaction_id,
+        "paypal_order_id": req.order_id,
+        "capture_data": capture_data
+    }
+
+# --- PAYPAL WEBHOOKS ---
+# Ingestion only validates and stores; the worker pool does verification,
+# captures and refunds, with retries/backoff and a dead-letter state.
+
+PAYPAL_WEBHOOK_ID = os.getenv("PAYPAL_WEBHOOK_ID")  # required: signatures are verified with PayPal
+# Local testing only (fake PayPal, webhook_replay): accept events without a signature check
+PAYPAL_WEBHOOK_ALLOW_UNVERIFIED = os.getenv("PAYPAL_WEBHOOK_ALLOW_UNVERIFIED") == "1"
+PAYPAL_EVENT_TYPES = {"CHECKOUT.ORDER.APPROVED", "PAYMENT.CAPTURE.COMPLETED", "PAYMENT.CAPTURE.REFUNDED"}
+WEBHOOK_HEADERS = ("paypal-auth-algo", "paypal-cert-url", "paypal-transmission-id",
+                   "paypal-transmission-sig", "paypal-transmission-time")
+
+def _verify_webhook(event):
+    """Ask PayPal to verify the signature; unsigned events are refused unless explicitly allowed"""
+    if event.headers.get("source") == "local":
+        return
+    if not PAYPAL_WEBHOOK_ID:
+        if PAYPAL_WEBHOOK_ALLOW_UNVERIFIED:
+            return
+        raise PermanentError("Cannot verify webhook: PAYPAL_WEBHOOK_ID is not configured")
+    response = paypal_bulkhead.call(
+        paypal_client.post,
+        f"{PAYPAL_API_BASE}/v1/notifications/verify-webhook-signature",
+        idempotent=True,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {get_paypal_access_token()}"},
+        json={
+            "auth_algo": event.headers.get("paypal-auth-algo"),
+            "cert_url": event.headers.get("paypal-cert-url"),
+            "transmission_id": event.headers.get("paypal-transmission-id"),
+            "transmission_sig": event.headers.get("paypal-transmission-sig"),
+            "transmission_time": event.headers.get("paypal-transmission-time"),
+            "webhook_id": PAYPAL_WEBHOOK_ID,
+            "webhook_event": event.payload,
+        },
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Signature check unavailable: {response.status_code}")
+    if response.json().get("verification_status") != "SUCCESS":
+        raise PermanentError("Webhook signature verification failed")
+
+def _event_transaction(resource):
+    """Our transaction for a PayPal order/capture/refund resource (custom_id, then order id)"""
+    custom_id = resource.get("custom_id") or next(
+        (pu.get("custom_id") for pu in resource.get("purchase_units", []) if pu.get("custom_id")), None
+    )
+    tx = transactions_by_id.get(custom_id) if custom_id else None
+    if tx is None:
+        related = resource.get("supplementary_data", {}).get("related_ids", {})
+        tx = transactions_by_order.get(related.get("order_id") or resource.get("id"))
+    if tx is None:
+        # May be a race with our own bookkeeping; retried, then dead-lettered
+        raise LookupError(f"No transaction for PayPal resource {resource.get('id')}")
+    return tx
+
+def handle_paypal_event(event):
+    resource = event.payload.get("resource", {})
+    if event.event_type not in PAYPAL_EVENT_TYPES:
+        return  # acknowledged and ignored
+    _verify_webhook(event)
+    tx = _event_transaction(resource)
+    
+    if event.event_type == "CHECKOUT.ORDER.APPROVED":
+        if tx.status == TxStatus.COMPLETED:
+            return
+        if tx.status != TxStatus.APPROVED:
+            raise PermanentError(f"Transaction {tx.id} is {tx.status}, not APPROVED")
+        capture_data = paypal_bulkhead.call(_capture_order, resource["id"])
+        capture_id = capture_data.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("id")
+        _mark_captured(tx, resource["id"], capture_id)
+    
+    elif event.event_type == "PAYMENT.CAPTURE.COMPLETED":
+        related = resource.get("supplementary_data", {}).get("related_ids", {})
+        _mark_captured(tx, related.get("order_id") or tx.paypal_order_id, resource.get("id"))
+    
+    elif event.event_type == "PAYMENT.CAPTURE.REFUNDED":
+        amount = resource.get("amount") or {"value": tx.amount, "currency_code": tx.currency}
+        try:
+            refund = Money.of(amount["value"], amount["currency_code"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise PermanentError(f"Invalid refund amount: {e}")
+        if refund.currency != tx.currency:
+            raise PermanentError(f"Refund in {refund.currency} for a {tx.currency} transaction")
+        with db_lock:
+            if resource.get("id") in applied_refunds or tx.status != TxStatus.COMPLETED:
+                return
+            applied_refunds.add(resource.get("id"))
+            # Partial refunds add up; never credit back more than was captured
+            already = refunded_totals.get(tx.id, Money.zero(tx.currency))
+            credit = min(refund, tx.money - already)
+            refunded_totals[tx.id] = already + credit
+            if refunded_totals[tx.id] >= tx.money:
+                _set_status(tx, TxStatus.REFUNDED)
+            ledger.refund(credit, charged_at=tx.captured_at)
+
+webhook_queue = WebhookQueue()
+webhook_workers = WorkerPool(webhook_queue, handle_paypal_event,
+                             workers=int(os.getenv("WEBHOOK_WORKERS", "4")))
+
+@app.post("/v1/paypal/webhook")
+async def paypal_webhook(request: Request):
+    """
+    PayPal webhook receiver. Stores the event durably and returns; PayPal
+    retries on non-2xx, and redeliveries of the same event id are ignored.
+    Disabled (503) until PAYPAL_WEBHOOK_ID is set, since events could not be verified.
+    """
+    if not PAYPAL_WEBHOOK_ID and not PAYPAL_WEBHOOK_ALLOW_UNVERIFIED:
+        raise HTTPException(status_code=503, detail="Webhook receiver disabled: PAYPAL_WEBHOOK_ID is not configured")
+    try:
+        event = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON")
+    if not isinstance(event, dict) or not event.get("id") or not event.get("event_type"):
+        raise HTTPException(status_code=400, detail="Missing event id or event_type")
+    headers = {h: request.headers[h] for h in WEBHOOK_HEADERS if h in request.headers}
+    if PAYPAL_WEBHOOK_ID and len(headers) < len(WEBHOOK_HEADERS):
+        raise HTTPException(status_code=400, detail="Missing PayPal transmission headers")
+    
+    queued = webhook_queue.enqueue(event["id"], event["event_type"], event, headers)
+    webhook_workers.notify()
+    return {"status": "queued" if queued else "duplicate", "event_id": event["id"]}
+
+@app.get("/v1/admin/webhooks")
+def get_webhook_events(status: Optional[str] = None, limit: int = 50):
+    """Queue depth per state plus the most recent events (payloads are replayable)"""
+    return {"counts": webhook_queue.counts(), "events": webhook_queue.events(status, limit)}
+
+@app.post("/v1/admin/webhooks/requeue")
+def requeue_webhook_events(event_ids: Optional[List[str]] = None):
+    """Retry dead-lettered events (all of them, or the given ids)"""
+    return {"requeued": webhook_queue.requeue_dead(event_ids)}
+
+# --- PAYPAL DEGRADATION -> 503/502/504 (fail fast, never tie up the server) ---
+
+@app.exception_handler(CircuitOpenError)
+async def paypal_circuit_open(request: Request, exc: CircuitOpenError):
+    return JSONResponse(status_code=503, headers={"Retry-After": str(int(exc.retry_after) + 1)},
+                        content={"detail": "PayPal is temporarily unavailable, please retry shortly"})
+
+@app.exception_handler(BulkheadFullError)
+async def paypal_bulkhead_full(request: Request, exc: BulkheadFullError):
+    return JSONResponse(status_code=503, headers={"Retry-After": "1"},
+                        content={"detail": "Too many checkouts in progress, please retry"})
+
+@app.exception_handler(UpstreamError)
+async def paypal_upstream_error(request: Request, exc: UpstreamError):
+    return JSONResponse(status_code=502, content={"detail": f"PayPal error: {exc}"})
+
+@app.exception_handler(requests.Timeout)
+async def paypal_timeout(request: Request, exc: requests.Timeout):
+    return JSONResponse(status_code=504, content={"detail": "PayPal did not respond in time"})
+
+@app.exception_handler(requests.ConnectionError)
+async def paypal_unreachable(request: Request, exc: requests.ConnectionError):
+    return JSONResponse(status_code=502, content={"detail": "PayPal is unreachable"})
+
+@app.exception_handler(requests.RequestException)
+async def paypal_request_failed(request: Request, exc: requests.RequestException):
+    # Anything else from requests (e.g. a truncated/chunked-encoding response)
+    return JSONResponse(status_code=502, content={"detail": f"PayPal request failed: {type(exc).__name__}"})
+
+@app.get("/v1/admin/paypal/health")
+def get_paypal_health():
+    """Circuit breaker state and bulkhead occupancy for the PayPal integration"""
+    return {"circuit": paypal_breaker.stats(), "bulkhead": paypal_bulkhead.stats()}
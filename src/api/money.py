@@ -0,0 +1,109 @@
+"""
+Exact money arithmetic in integer minor units (cents, pence, yen...).
+
+Money never goes through float arithmetic: amounts are parsed via Decimal
+once at the edge (request models, config) and from then on only integers
+are added, compared and stored. Mixing currencies raises instead of
+silently adding dollars to euros.
+"""
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# ISO 4217 minor-unit exponents for the currencies we accept
+CURRENCY_EXPONENTS = {
+    "USD": 2, "EUR": 2, "GBP": 2, "CAD": 2, "AUD": 2, "CHF": 2, "JPY": 0,
+}
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥"}
+
+
+class CurrencyMismatch(ValueError):
+    pass
+
+
+def exponent(currency):
+    try:
+        return CURRENCY_EXPONENTS[currency]
+    except KeyError:
+        raise ValueError(f"Unsupported currency: {currency}")
+
+
+@dataclass(frozen=True, slots=True)
+class Money:
+    minor: int
+    currency: str = "USD"
+
+    @classmethod
+    def of(cls, amount, currency="USD"):
+        """Major units (float/str/int/Decimal) -> Money, rounded half-up; ValueError if not a finite amount"""
+        currency = currency.upper()
+        quantum = Decimal(1).scaleb(-exponent(currency))
+        try:
+            value = Decimal(str(amount))
+            if not value.is_finite():
+                raise ValueError(f"Amount must be a finite number, got {amount!r}")
+            value = value.quantize(quantum, rounding=ROUND_HALF_UP)
+        except InvalidOperation:  # unparsable, or too many digits to quantize
+            raise ValueError(f"Invalid amount: {amount!r}")
+        return cls(int(value.scaleb(exponent(currency))), currency)
+
+    @classmethod
+    def zero(cls, currency="USD"):
+        return cls(0, currency.upper())
+
+    def to_decimal(self):
+        return Decimal(self.minor).scaleb(-exponent(self.currency))
+
+    def to_float(self):
+        """For JSON/display only; never feed this back into arithmetic"""
+        return self.minor / 10 ** exponent(self.currency)
+
+    def value_str(self):
+        """Fixed-point string in major units, e.g. "45.00" (PayPal 'value')"""
+        return f"{self.to_decimal():.{exponent(self.currency)}f}"
+
+    def _check(self, other):
+        if not isinstance(other, Money):
+            raise TypeError(f"Cannot combine Money with {type(other).__name__}")
+        if other.currency != self.currency:
+            raise CurrencyMismatch(f"{self.currency} vs {other.currency}")
+        return other
+
+    def __add__(self, other):
+        return Money(self.minor + self._check(other).minor, self.currency)
+
+    def __sub__(self, other):
+        return Money(self.minor - self._check(other).minor, self.currency)
+
+    def __lt__(self, other):
+        return self.minor < self._check(other).minor
+
+    def __le__(self, other):
+        return self.minor <= self._check(other).minor
+
+    def __gt__(self, other):
+        return self.minor > self._check(other).minor
+
+    def __ge__(self, other):
+        return self.minor >= self._check(other).minor
+
+    def __str__(self):
+        symbol = CURRENCY_SYMBOLS.get(self.currency)
+        return f"{symbol}{self.value_str()}" if symbol else f"{self.value_str()} {self.currency}"
+
+
+# --- BATCH SUMS (reporting) ---
+def totals_by_currency(minor_units, currencies):
+    """Group-and-sum two parallel columns -> {currency: Money}"""
+    try:
+        import numpy as np
+    except ImportError:
+        totals = {}
+        for value, currency in zip(minor_units, currencies):
+            totals[currency] = totals.get(currency, 0) + value
+        return {c: Money(v, c) for c, v in totals.items()}
+    if len(currencies) == 0:
+        return {}
+    codes, inverse = np.unique(np.asarray(currencies), return_inverse=True)
+    sums = np.zeros(len(codes), dtype=np.int64)
+    np.add.at(sums, inverse, np.asarray(minor_units, dtype=np.int64))
+    return {str(c): Money(int(v), str(c)) for c, v in zip(codes, sums)}
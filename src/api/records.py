@@ -0,0 +1,170 @@
+"""
+Compact in-memory transaction records.
+
+A plain dict per transaction pays for a hash table and a copy of every key
+reference on every row. Transaction instead uses __slots__ with:
+- amounts as integer minor units plus an ISO currency code (exact, see
+  money.py),
+- statuses as a str Enum (one shared object per status, JSON-serializes as
+  the plain string),
+- merchant / risk reason strings interned, since they repeat heavily,
+- the timestamp as epoch seconds, rendered to ISO-8601 only on output.
+
+to_dict() keeps the field names the API has always returned, so existing
+clients keep working.
+"""
+import itertools
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime
+from enum import Enum
+
+from src.api.money import Money
+
+
+class TxStatus(str, Enum):
+    APPROVED = "APPROVED"
+    DENIED = "DENIED"
+    PENDING_APPROVAL = "PENDING_APPROVAL"
+    COMPLETED = "COMPLETED"
+    REFUNDED = "REFUNDED"
+
+    def __str__(self):
+        return self.value
+
+
+class Transaction:
+    __slots__ = (
+        "id", "created_at", "agent_id", "merchant", "item", "amount_minor", "currency",
+        "status", "risk_reason", "paypal_order_id", "paypal_capture_id", "captured_at",
+    )
+
+    def __init__(self, id, merchant, item, money, status, risk_reason="",
+                 agent_id="", created_at=None, paypal_order_id=None, paypal_capture_id=None):
+        self.id = id
+        self.created_at = datetime.now().timestamp() if created_at is None else created_at
+        self.agent_id = sys.intern(agent_id)
+        self.merchant = sys.intern(merchant)
+        self.item = item
+        self.amount_minor = money.minor
+        self.currency = sys.intern(money.currency)
+        self.status = TxStatus(status)
+        self.risk_reason = sys.intern(risk_reason)
+        self.paypal_order_id = paypal_order_id
+        self.paypal_capture_id = paypal_capture_id
+        self.captured_at = None  # epoch seconds the budget was charged (refunds credit that bucket)
+
+    @property
+    def money(self):
+        return Money(self.amount_minor, self.currency)
+
+    @property
+    def amount(self):
+        """Major units as float, for JSON/display"""
+        return self.money.to_float()
+
+    @property
+    def timestamp(self):
+        return datetime.fromtimestamp(self.created_at).isoformat()
+
+    def to_dict(self):
+        row = {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "agent_id": self.agent_id,
+            "merchant": self.merchant,
+            "amount": self.amount,
+            "currency": self.currency,
+            "item": self.item,
+            "status": self.status.value,
+            "risk_reason": self.risk_reason,
+        }
+        if self.paypal_order_id is not None:
+            row["paypal_order_id"] = self.paypal_order_id
+        if self.paypal_capture_id is not None:
+            row["paypal_capture_id"] = self.paypal_capture_id
+        return row
+
+    def __repr__(self):
+        return f"Transaction({self.id!r}, {self.merchant!r}, {self.money}, {self.status.value})"
+
+
+# --- COLUMNAR VIEW (analytics / export) ---
+COLUMNS = ("id", "timestamp", "agent_id", "merchant", "amount", "amount_minor", "currency",
+           "item", "status", "risk_reason")
+
+
+def columnar(records, columns=COLUMNS):
+    """
+    Column-oriented copy of the given records: {column: sequence}.
+    Numeric columns are packed arrays (8 bytes per value), ready for
+    pandas/pyarrow/numpy without a per-row dict step.
+    """
+    records = list(records)
+    out = {}
+    for c in columns:
+        if c == "amount_minor":
+            out[c] = array("q", (r.amount_minor for r in records))
+        elif c == "amount":
+            out[c] = array("d", (r.amount for r in records))
+        elif c == "created_at":
+            out[c] = array("d", (r.created_at for r in records))
+        elif c == "status":
+            out[c] = [r.status.value for r in records]
+        else:
+            out[c] = [getattr(r, c) for r in records]
+    return out
+
+
+# --- PER-STATUS INDEX (filtered log pages) ---
+class StatusIndex:
+    """
+    Transactions per status, in creation order. A status's total is O(1) and
+    one page of it is a list slice; a status change costs a bisect on the old
+    and new status lists instead of a scan of the whole log.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._seq = itertools.count()
+            self._order = {}      # tx id -> creation sequence
+            self._records = {}    # creation sequence -> Transaction
+            self._by_status = {}  # status -> sorted [creation sequence]
+
+    def add(self, tx):
+        with self._lock:
+            seq = next(self._seq)
+            self._order[tx.id] = seq
+            self._records[seq] = tx
+            self._by_status.setdefault(tx.status, []).append(seq)
+
+    def move(self, tx, old_status, new_status):
+        with self._lock:
+            seq = self._order.get(tx.id)
+            if seq is None or old_status == new_status:
+                return
+            old = self._by_status.get(old_status, [])
+            i = bisect_left(old, seq)
+            if i < len(old) and old[i] == seq:
+                del old[i]
+            insort(self._by_status.setdefault(new_status, []), seq)
+
+    def count(self, status):
+        with self._lock:
+            return len(self._by_status.get(status, ()))
+
+    def page(self, status, start, stop):
+        """Records [start:stop] of one status, oldest first"""
+        with self._lock:
+            return [self._records[s] for s in self._by_status.get(status, [])[start:stop]]
+
+    def records(self, status):
+        """Snapshot of every record with this status, oldest first"""
+        with self._lock:
+            return [self._records[s] for s in self._by_status.get(status, ())]
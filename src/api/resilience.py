@@ -0,0 +1,200 @@
+"""
+Fault isolation for outbound calls (PayPal).
+
+- Bulkhead: a dedicated, bounded thread pool. When PayPal is slow its calls
+  pile up here instead of in the server's shared threadpool, and once the pool
+  and its small wait queue are full new calls fail fast. /v1/agent/pay never
+  competes with checkout traffic for threads.
+- CircuitBreaker: tracks the failure rate over the last `window` calls and
+  opens when it crosses `failure_rate`. While open, calls fail immediately.
+  After `open_seconds` a single trial call is let through (half-open): success
+  closes the breaker, failure re-opens it.
+- ResilientClient: HTTP with per-call timeouts, both of the above, and
+  full-jitter retries for calls the caller marks idempotent.
+
+Any exception (timeouts, connection errors, broken responses), 429 and 5xx
+count as failures; other 4xx are the caller's problem and count as
+successes for the breaker.
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} circuit is open")
+        self.retry_after = retry_after
+
+
+class BulkheadFullError(Exception):
+    pass
+
+
+class UpstreamError(Exception):
+    """A retryable failure response (429/5xx) after retries ran out"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def backoff_delay(attempts, base=1.0, cap=300.0):
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^(n-1)))"""
+    return random.uniform(0, min(cap, base * 2 ** (attempts - 1)))
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_rate=0.5, window=20, min_calls=5, open_seconds=30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)  # True = failure
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may proceed now"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            retry_after = max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+            raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, failed):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trial_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(failed)
+            failures = sum(self._outcomes)
+            if (self._state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "recent_calls": len(self._outcomes),
+                "recent_failures": sum(self._outcomes),
+            }
+
+
+class Bulkhead:
+    def __init__(self, name, max_concurrent=8, max_queued=8):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_concurrent, thread_name_prefix=f"{name}-bulkhead")
+        self._slots = threading.BoundedSemaphore(max_concurrent + max_queued)
+        self._in_use = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise BulkheadFullError(f"{self.name} bulkhead is full")
+        with self._lock:
+            self._in_use += 1
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn in the bulkhead and block for its result (worker threads)"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn in the bulkhead without holding an event-loop or server thread"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self):
+        with self._lock:
+            return {"in_use": self._in_use, "capacity": self.max_concurrent + self.max_queued,
+                    "rejected": self._rejected}
+
+
+class ResilientClient:
+    def __init__(self, name, timeout=(3.05, 10.0), retries=2, backoff_base=0.2, backoff_cap=2.0,
+                 breaker=None, session=None):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker or CircuitBreaker(name)
+        self.session = session or requests.Session()
+
+    def request(self, method, url, idempotent=False, **kwargs):
+        """
+        One HTTP call through the breaker. Idempotent calls are retried on
+        failure (with jitter) while the breaker stays closed.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 + (self.retries if idempotent else 0)
+        for attempt in range(1, attempts + 1):
+            self.breaker.before_call()
+            failed = True  # whatever escapes is a failure, so a half-open trial always completes
+            try:
+                response = self.session.request(method, url, **kwargs)
+                failed = response.status_code == 429 or response.status_code >= 500
+            except requests.RequestException:
+                if attempt == attempts:
+                    raise
+            else:
+                if not failed:
+                    return response
+                if attempt == attempts:
+                    raise UpstreamError(response)
+            finally:
+                self.breaker.record(failed=failed)
+            time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+
+    def post(self, url, idempotent=False, **kwargs):
+        return self.request("POST", url, idempotent=idempotent, **kwargs)
@@ -0,0 +1,173 @@
+"""
+The pure, config-dependent half of the risk decision.
+
+classify() answers "is this merchant blocked, and do the merchant/item texts
+trip a risk keyword?" The answer depends only on the normalized
+(merchant, item) pair and the current rules, so DecisionCache memoizes it
+with LRU eviction. The cache empties itself when the rules change.
+
+Keywords are matched against the folded words of a text (homoglyphs and
+leetspeak undone, spelled-out letters rejoined, see fuzzy.phrase), never
+across word boundaries, and always exactly: a misspelling of "untrusted"
+is just as likely to be "Trusted Shops". Only whole merchant names get a
+bounded edit-distance lookup, against the blocklist (see fuzzy.py). A folded
+blocklist hit is blocked outright. An edit-distance-only hit goes to human
+review as a look-alike.
+
+The stateful checks (remaining budget, amount threshold) are NOT cached;
+process_payment runs them on every request.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Tuple
+
+from src.api.fuzzy import DeletionIndex, fold, phrase
+
+SUSPICIOUS_ITEM_KEYWORDS = ("crypto", "gift card", "casino", "mystery", "hacked", "stolen")
+SUSPICIOUS_MERCHANT_KEYWORDS = (
+    "scam", "scammy", "sketchy", "dark", "darkweb", "hack", "illegal",
+    "fraud", "suspicious", "unknown", "untrusted", "shady", "fake",
+)
+
+ITEM_RISK_REASON = "High-risk item category detected"
+MERCHANT_RISK_REASON = "Suspicious merchant detected"
+LOOKALIKE_RISK_REASON = "Merchant resembles a blocked merchant"
+AMOUNT_RISK_REASON = "Amount exceeds auto-approval limit"
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    blocked_merchants: frozenset
+    item_keywords: Tuple[str, ...]
+    merchant_keywords: Tuple[str, ...]
+    # Folded forms ("gift card" and "giftcard") + blocklist index, built once per rules change
+    folded_item_keywords: Tuple[str, ...] = field(default=(), repr=False)
+    folded_merchant_keywords: Tuple[str, ...] = field(default=(), repr=False)
+    blocklist_index: DeletionIndex = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_config(cls, config):
+        blocked = frozenset(normalize(m) for m in config["blocked_merchants"])
+        item_keywords = tuple(config.get("suspicious_item_keywords", SUSPICIOUS_ITEM_KEYWORDS))
+        merchant_keywords = tuple(config.get("suspicious_merchant_keywords", SUSPICIOUS_MERCHANT_KEYWORDS))
+        return cls(
+            blocked_merchants=blocked,
+            item_keywords=item_keywords,
+            merchant_keywords=merchant_keywords,
+            folded_item_keywords=_folded_forms(item_keywords),
+            folded_merchant_keywords=_folded_forms(merchant_keywords),
+            blocklist_index=DeletionIndex(fold(m) for m in blocked),
+        )
+
+
+def _folded_forms(keywords):
+    """Each keyword as folded words, plus glued together for multi-word ones"""
+    forms = dict.fromkeys(f for k in keywords for f in (phrase(k), fold(k)) if f)
+    return tuple(forms)
+
+
+@dataclass(frozen=True)
+class Classification:
+    blocked: bool
+    risk_reason: str  # "" when no keyword matched; merchant reasons win over item reasons
+
+
+def classify(rules, merchant, item):
+    """merchant and item must already be normalized"""
+    folded_merchant = fold(merchant)
+    if merchant in rules.blocked_merchants or folded_merchant in rules.blocklist_index.terms:
+        return Classification(blocked=True, risk_reason="")
+    if folded_merchant and rules.blocklist_index.lookup(folded_merchant):
+        return Classification(blocked=False, risk_reason=LOOKALIKE_RISK_REASON)
+    # Disguised keywords inside a word of the name ("sk3tchy", "d.a.r.k-web-shop")
+    merchant_words = phrase(merchant)
+    if any(word in merchant for word in rules.merchant_keywords) or any(word in merchant_words for word in rules.folded_merchant_keywords):
+        return Classification(blocked=False, risk_reason=MERCHANT_RISK_REASON)
+    item_words = phrase(item)
+    if any(word in item for word in rules.item_keywords) or any(word in item_words for word in rules.folded_item_keywords):
+        return Classification(blocked=False, risk_reason=ITEM_RISK_REASON)
+    return Classification(blocked=False, risk_reason="")
+
+
+@dataclass(frozen=True)
+class Decision:
+    status: str            # APPROVED, DENIED, PENDING_APPROVAL
+    risk_reason: str = ""
+    denied_by: str = ""    # "blocklist" | "budget" when DENIED
+
+
+def decide(classification, amount, remaining, threshold):
+    """
+    The rule outcome for one request, given its classification and the budget
+    headroom at decision time. Pure, so shadow rule sets can replay it exactly.
+    """
+    # 1. Blocked Merchants (Compliance Rule)
+    if classification.blocked:
+        return Decision("DENIED", denied_by="blocklist")
+    # 2. Budget (Financial Health Rule)
+    if amount > remaining:
+        return Decision("DENIED", denied_by="budget")
+    # 3. Risk Analysis: merchant keywords outrank item keywords, which outrank the amount limit
+    risk_reason = classification.risk_reason
+    if not risk_reason and amount > threshold:
+        risk_reason = AMOUNT_RISK_REASON
+    return Decision("PENDING_APPROVAL" if risk_reason else "APPROVED", risk_reason)
+
+
+class DecisionCache:
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._rules_key = None
+        self._rules = None
+        self.hits = 0
+        self.misses = 0
+
+    def rules_for(self, config):
+        """
+        Current RuleSet. Rebuilt (and the cache emptied) only when the rule
+        lists in config differ from the previous snapshot.
+        """
+        key = (
+            tuple(config["blocked_merchants"]),
+            tuple(config.get("suspicious_item_keywords", SUSPICIOUS_ITEM_KEYWORDS)),
+            tuple(config.get("suspicious_merchant_keywords", SUSPICIOUS_MERCHANT_KEYWORDS)),
+        )
+        with self._lock:
+            if key != self._rules_key:
+                self._rules_key = key
+                self._rules = RuleSet.from_config(config)
+                self._entries.clear()
+            return self._rules
+
+    def classify(self, config, merchant_name, item_description):
+        rules = self.rules_for(config)
+        key = (normalize(merchant_name), normalize(item_description))
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = classify(rules, *key)
+        with self._lock:
+            if self._rules is rules:  # rules may have changed while we computed
+                self._entries[key] = result
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,210 @@
+"""
+Shadow-mode evaluation of candidate rule sets.
+
+process_payment hands every decision's inputs to ShadowEvaluator.submit().
+That does one put_nowait() onto a bounded queue and returns. If the queue is
+full the item is dropped and counted, so shadow work can never slow a real
+authorization down. A single background thread drains the queue, and for
+each input it:
+- appends it to a bounded ring of recent inputs (for replay), and
+- re-runs rules.decide() under every registered candidate snapshot, then
+  records whether the candidate agrees with the production decision.
+
+Inputs carry the budget headroom seen at decision time, so an evaluation or
+a later replay is deterministic. Candidates can change the blocklist,
+keywords and approval thresholds. Budgets are stateful and always come from
+production.
+"""
+import queue
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+
+from src.api.rules import DecisionCache, decide
+
+
+class ShadowInput:
+    __slots__ = ("tx_id", "merchant", "item", "amount", "remaining", "decision", "at")
+
+    def __init__(self, tx_id, merchant, item, amount, remaining, decision, at):
+        self.tx_id = tx_id
+        self.merchant = merchant
+        self.item = item
+        self.amount = amount
+        self.remaining = remaining
+        self.decision = decision
+        self.at = at
+
+
+def _label(decision):
+    return f"{decision.status}:{decision.risk_reason or decision.denied_by}".rstrip(":")
+
+
+class Candidate:
+    """A frozen rule snapshot plus its running agreement stats"""
+
+    def __init__(self, name, config, thresholds, samples=100):
+        self.name = name
+        self.config = config
+        self.thresholds = thresholds     # {currency: Money}
+        self.cache = DecisionCache(maxsize=2000)
+        self.evaluated = 0
+        self.disagreed = 0
+        self.matrix = Counter()          # "production -> shadow" status pairs
+        self.samples = deque(maxlen=samples)
+        self.eval_seconds = 0.0
+        self.errors = 0
+        self.last_error = None
+
+    def evaluate(self, item, production_thresholds):
+        classification = self.cache.classify(self.config, item.merchant, item.item)
+        threshold = self.thresholds.get(item.amount.currency) or production_thresholds[item.amount.currency]
+        return decide(classification, item.amount, item.remaining, threshold)
+
+    def record(self, item, shadow_decision, elapsed):
+        self.evaluated += 1
+        self.eval_seconds += elapsed
+        if shadow_decision == item.decision:
+            return
+        self.disagreed += 1
+        self.matrix[f"{item.decision.status} -> {shadow_decision.status}"] += 1
+        self.samples.append({
+            "transaction_id": item.tx_id,
+            "merchant": item.merchant,
+            "item": item.item,
+            "amount": str(item.amount),
+            "production": _label(item.decision),
+            "shadow": _label(shadow_decision),
+            "at": item.at,
+        })
+
+    def record_error(self, item, error):
+        self.errors += 1
+        self.last_error = f"{type(error).__name__}: {error} (transaction {item.tx_id})"
+
+    def stats(self):
+        return {
+            "evaluated": self.evaluated,
+            "disagreements": self.disagreed,
+            "agreement_rate": 1 - self.disagreed / self.evaluated if self.evaluated else None,
+            "matrix": dict(self.matrix),
+            "avg_eval_us": round(self.eval_seconds / self.evaluated * 1e6, 1) if self.evaluated else None,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "recent_disagreements": list(self.samples)[::-1],
+        }
+
+
+class ShadowEvaluator:
+    def __init__(self, production_thresholds, queue_size=1000, history_size=10000):
+        self.production_thresholds = production_thresholds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._history = deque(maxlen=history_size)   # recent inputs, oldest first
+        self._candidates = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._counter_lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+
+    # --- hot path ---
+    def submit(self, tx_id, merchant, item, amount, remaining, decision):
+        """Never blocks: drops (and counts) the input when the queue is full"""
+        try:
+            self._queue.put_nowait(ShadowInput(tx_id, merchant, item, amount, remaining, decision, time.time()))
+            dropped = 0
+        except queue.Full:
+            dropped = 1
+        with self._counter_lock:
+            self.submitted += 1
+            self.dropped += dropped
+
+    # --- candidates ---
+    def add_candidate(self, name, config, thresholds):
+        with self._lock:
+            self._candidates[name] = Candidate(name, config, thresholds)
+
+    def remove_candidate(self, name):
+        with self._lock:
+            return self._candidates.pop(name, None) is not None
+
+    def candidates(self):
+        with self._lock:
+            return list(self._candidates.values())
+
+    # --- background worker ---
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._process(item)
+
+    def drain(self):
+        """Process everything queued right now on the calling thread (tests/replay)"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._process(item)
+
+    def _process(self, item):
+        self._history.append(item)
+        for candidate in self.candidates():
+            self._observe(candidate, item, self._lock)
+
+    def _observe(self, candidate, item, lock):
+        started = time.perf_counter()
+        try:
+            shadow_decision = candidate.evaluate(item, self.production_thresholds)
+        except Exception as e:  # a broken snapshot is counted, it must not kill the worker
+            with lock:
+                candidate.record_error(item, e)
+            return
+        with lock:
+            candidate.record(item, shadow_decision, time.perf_counter() - started)
+
+    # --- deterministic replay ---
+    def replay(self, name, config, thresholds, limit=None):
+        """Evaluate a rule snapshot against recorded inputs (newest `limit`), synchronously"""
+        candidate = Candidate(name, config, thresholds)
+        items = list(self._history)
+        for item in items[-limit:] if limit else items:
+            self._observe(candidate, item, nullcontext())
+        return candidate.stats()
+
+    def stats(self):
+        with self._lock:
+            candidates = {c.name: c.stats() for c in self._candidates.values()}
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "recorded_inputs": len(self._history),
+            "candidates": candidates,
+        }
+
+    def clear(self):
+        self._history.clear()
+        with self._lock:
+            for name, c in list(self._candidates.items()):
+                self._candidates[name] = Candidate(name, c.config, c.thresholds)
+        with self._counter_lock:
+            self.submitted = 0
+            self.dropped = 0
@@ -0,0 +1,131 @@
+"""
+Local PayPal webhook replayer.
+
+POSTs webhook events at a running API, either synthesized for an existing
+transaction or replayed from a file, and reports ingestion latency. Use it
+to exercise the queue without a public URL or a PayPal sandbox:
+redeliveries (--duplicates), out-of-order delivery (--shuffle) and bursts
+(--concurrency).
+
+Usage:
+    python -m src.api.webhook_replay --tx 1a2b3c4d --event capture
+    python -m src.api.webhook_replay --tx 1a2b3c4d --event capture refund --duplicates 3 --shuffle
+    python -m src.api.webhook_replay --file events.json --concurrency 32
+
+--file accepts a JSON list, JSON lines, or the output of GET /v1/admin/webhooks.
+Synthesized events are unsigned, so run the API with PAYPAL_WEBHOOK_ALLOW_UNVERIFIED=1.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+API_BASE = "http://127.0.0.1:8000"
+
+
+def _amount(tx):
+    return {"currency_code": tx.get("currency", "USD"), "value": f"{tx['amount']:.2f}"}
+
+
+def synthesize(tx, event_type):
+    """A PayPal-shaped event for one of our transactions (as returned by the admin API)"""
+    order_id = tx.get("paypal_order_id") or f"REPLAY-ORDER-{tx['id']}"
+    capture_id = tx.get("paypal_capture_id") or f"REPLAY-CAPTURE-{tx['id']}"
+    related = {"order_id": order_id, "capture_id": capture_id}
+    if event_type == "approved":
+        kind, resource = "CHECKOUT.ORDER.APPROVED", {
+            "id": order_id, "status": "APPROVED",
+            "purchase_units": [{"custom_id": tx["id"], "amount": _amount(tx)}],
+        }
+    elif event_type == "capture":
+        kind, resource = "PAYMENT.CAPTURE.COMPLETED", {
+            "id": capture_id, "status": "COMPLETED", "amount": _amount(tx), "custom_id": tx["id"],
+            "supplementary_data": {"related_ids": related},
+        }
+    elif event_type == "refund":
+        kind, resource = "PAYMENT.CAPTURE.REFUNDED", {
+            "id": f"REPLAY-REFUND-{tx['id']}", "status": "COMPLETED", "amount": _amount(tx),
+            "custom_id": tx["id"], "supplementary_data": {"related_ids": related},
+        }
+    else:
+        raise ValueError(f"Unknown event type: {event_type}")
+    return {
+        "id": f"WH-REPLAY-{uuid.uuid4().hex[:12]}",
+        "event_type": kind,
+        "create_time": datetime.now(timezone.utc).isoformat(),
+        "resource": resource,
+    }
+
+
+def load_events(path):
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get("events", [data])
+    # Rows from /v1/admin/webhooks wrap the original event in "payload"
+    return [row.get("payload", row) for row in data]
+
+
+def replay(events, api_base=API_BASE, concurrency=8):
+    """POST every event; returns (statuses, latencies_ms)"""
+    session = requests.Session()
+
+    def post(event):
+        started = time.perf_counter()
+        res = session.post(f"{api_base}/v1/paypal/webhook", json=event, timeout=10)
+        elapsed = (time.perf_counter() - started) * 1000
+        status = res.json().get("status") if res.ok else f"HTTP {res.status_code}"
+        return status, elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(post, events))
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay PayPal webhook events against AgentGuard")
+    parser.add_argument("--api", default=API_BASE)
+    parser.add_argument("--tx", action="append", default=[], help="Transaction id to synthesize events for")
+    parser.add_argument("--event", nargs="+", default=["capture"], choices=["approved", "capture", "refund"])
+    parser.add_argument("--file", help="Replay recorded events from this file")
+    parser.add_argument("--duplicates", type=int, default=1, help="Deliver every event this many times")
+    parser.add_argument("--shuffle", action="store_true", help="Deliver in random order")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    events = load_events(args.file) if args.file else []
+    for tx_id in args.tx:
+        res = requests.get(f"{args.api}/v1/admin/transactions/{tx_id}", timeout=10)
+        if res.status_code == 404:
+            print(f"❌ [REPLAY]: transaction {tx_id} not found")
+            return 1
+        events += [synthesize(res.json(), kind) for kind in args.event]
+    if not events:
+        parser.error("nothing to replay: pass --tx or --file")
+
+    events = events * args.duplicates
+    if args.shuffle:
+        random.shuffle(events)
+
+    statuses, latencies = replay(events, args.api, args.concurrency)
+    latencies.sort()
+    counts = {s: statuses.count(s) for s in sorted(set(statuses))}
+    print(f"📨 [REPLAY]: {len(events)} deliveries -> {counts}")
+    print(f"⏱️  [REPLAY]: ingest p50 {latencies[len(latencies) // 2]:.1f} ms, "
+          f"p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:.1f} ms")
+    print(json.dumps(requests.get(f"{args.api}/v1/admin/webhooks?limit=0", timeout=10).json()["counts"]))
+    return 0 if all(not s.startswith("HTTP") for s in statuses) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
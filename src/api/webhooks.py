@@ -0,0 +1,228 @@
+"""
+Durable queue + worker pool for PayPal webhook events.
+
+The webhook endpoint only does cheap structural checks and an INSERT into a
+local SQLite table (WAL mode), so it answers in about a millisecond however
+slow PayPal or the handlers are. Worker threads claim due events with a
+lease, run the handler and either:
+- ack it (done),
+- reschedule it with jittered exponential backoff, or
+- move it to the dead-letter state after max_attempts (or a PermanentError).
+
+Events are keyed by PayPal's event id, so PayPal redeliveries and replays
+are ignored. A crashed worker's lease expires and another worker picks the
+event up again, so handlers must be idempotent.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.api.resilience import backoff_delay
+
+DEFAULT_PATH = os.getenv("WEBHOOK_QUEUE_PATH", "webhook_queue.sqlite3")
+
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id          TEXT PRIMARY KEY,
+    event_type  TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    headers     TEXT NOT NULL DEFAULT '{}',
+    status      TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    next_run_at REAL NOT NULL,
+    lease_until REAL,
+    last_error  TEXT,
+    received_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS events_due ON events (status, next_run_at);
+"""
+
+
+class PermanentError(Exception):
+    """Raised by a handler when retrying can never succeed (e.g. bad signature)"""
+
+
+class WebhookEvent:
+    __slots__ = ("id", "event_type", "payload", "headers", "attempts")
+
+    def __init__(self, id, event_type, payload, headers, attempts):
+        self.id = id
+        self.event_type = event_type
+        self.payload = payload
+        self.headers = headers
+        self.attempts = attempts
+
+
+class WebhookQueue:
+    def __init__(self, path=DEFAULT_PATH, lease_seconds=60.0, clock=time.time):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable across app crashes, fast commits
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, event_id, event_type, payload, headers=None):
+        """Store an event; returns False if this event id was already received"""
+        now = self._clock()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO events (id, event_type, payload, headers, status, next_run_at, received_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (event_id, event_type, json.dumps(payload), json.dumps(headers or {}), QUEUED, now, now),
+            )
+            return cur.rowcount == 1
+
+    def claim(self):
+        """Lease the next due event (or one whose lease expired), or None"""
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # also safe across processes sharing the file
+            try:
+                row = self._conn.execute(
+                    "SELECT id, event_type, payload, headers, attempts FROM events"
+                    " WHERE (status = ? AND next_run_at <= ?) OR (status = ? AND lease_until <= ?)"
+                    " ORDER BY next_run_at LIMIT 1",
+                    (QUEUED, now, PROCESSING, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE events SET status = ?, attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                    (PROCESSING, now + self.lease_seconds, row[0]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        event_id, event_type, payload, headers, attempts = row
+        return WebhookEvent(event_id, event_type, json.loads(payload), json.loads(headers), attempts + 1)
+
+    def ack(self, event_id):
+        self._finish(event_id, DONE, None)
+
+    def dead_letter(self, event_id, error):
+        self._finish(event_id, DEAD, error)
+
+    def retry(self, event_id, error, delay):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE events SET status = ?, next_run_at = ?, lease_until = NULL, last_error = ? WHERE id = ?",
+                (QUEUED, self._clock() + delay, error, event_id),
+            )
+
+    def _finish(self, event_id, status, error):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE events SET status = ?, lease_until = NULL, last_error = ?, finished_at = ? WHERE id = ?",
+                (status, error, self._clock(), event_id),
+            )
+
+    def requeue_dead(self, event_ids=None):
+        """Give dead-lettered events a fresh set of attempts; returns how many"""
+        query = "UPDATE events SET status = ?, attempts = 0, next_run_at = ?, last_error = NULL WHERE status = ?"
+        params = [QUEUED, self._clock(), DEAD]
+        if event_ids:
+            query += f" AND id IN ({','.join('?' * len(event_ids))})"
+            params += list(event_ids)
+        with self._lock:
+            return self._conn.execute(query, params).rowcount
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM events GROUP BY status").fetchall()
+        return {QUEUED: 0, PROCESSING: 0, DONE: 0, DEAD: 0, **dict(rows)}
+
+    def events(self, status=None, limit=50):
+        """Most recent events first, payload included (replayable)"""
+        query = "SELECT id, event_type, status, attempts, last_error, received_at, payload FROM events"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY received_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        keys = ("id", "event_type", "status", "attempts", "last_error", "received_at", "payload")
+        return [{**dict(zip(keys, r)), "payload": json.loads(r[6])} for r in rows]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM events")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WorkerPool:
+    """N threads draining a WebhookQueue through handler(event)"""
+
+    def __init__(self, queue, handler, workers=4, max_attempts=8,
+                 backoff_base=1.0, backoff_cap=300.0, poll_interval=0.5):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"webhook-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Wake idle workers (called right after an enqueue)"""
+        self._wake.set()
+
+    def run_once(self):
+        """Process at most one due event; returns False if nothing was due"""
+        event = self.queue.claim()
+        if event is None:
+            return False
+        try:
+            self.handler(event)
+        except PermanentError as e:
+            self.queue.dead_letter(event.id, str(e))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if event.attempts >= self.max_attempts:
+                self.queue.dead_letter(event.id, error)
+            else:
+                delay = backoff_delay(event.attempts, self.backoff_base, self.backoff_cap)
+                self.queue.retry(event.id, error, delay)
+        else:
+            self.queue.ack(event.id)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
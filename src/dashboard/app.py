@@ -1,7 +1,5 @@
 import streamlit as st
-import requests
 import pandas as pd
-import json
 import os
 import time
 from openai import OpenAI
@@ -10,14 +8,18 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# --- CONFIGURATION ---
-API_URL = "http://127.0.0.1:8000"
+# Run from the repo root: python -m streamlit run src/dashboard/app.py
+from src.dashboard.components import api_client as api
+from src.agent.replies import StreamedMessage, templated_reply
+from src.agent.runtime import run_tool_calls
+from src.agent.memory import ConversationMemory
 
 st.set_page_config(page_title="AgentGuard Command Center", layout="wide")
 
 # Initialize session state for chat history
-if 'messages' not in st.session_state:
-    st.session_state.messages = []
+if 'memory' not in st.session_state:
+    # Bounded chat context: recent turns verbatim, older ones summarized
+    st.session_state.memory = ConversationMemory(token_budget=1500, summary_budget=300)
 if 'last_transaction' not in st.session_state:
     st.session_state.last_transaction = None
 
@@ -112,30 +114,31 @@ st.markdown("""
 
 # --- SIDEBAR & CONFIG ---
 try:
-    # Fetch live config from our API
-    config_res = requests.get(f"{API_URL}/config")
-    if config_res.status_code == 200:
-        USER_CONFIG = config_res.json()
-        
-        with st.sidebar:
-            st.header("Configuration")
-            st.metric("Budget Remaining", f"${USER_CONFIG['daily_budget'] - USER_CONFIG['spent_today']:.2f}")
-            st.progress(min(USER_CONFIG['spent_today'] / USER_CONFIG['daily_budget'], 1.0))
-            
-            if st.button("Reset App State"):
-                try:
-                    requests.post(f"{API_URL}/reset")
-                except:
-                    pass # Ignore if API is down, still clear frontend
-                st.session_state.messages = []
-                st.session_state.last_transaction = None
-                st.rerun()
-    else:
-        USER_CONFIG = {"daily_budget": 0, "spent_today": 0} # Fallback
-        st.sidebar.error("Could not fetch config")
+    # Fetch config, pending queue and analytics in one (cached) round trip
+    SNAPSHOT = api.get_snapshot()
+    USER_CONFIG = SNAPSHOT["config"]
+
+    with st.sidebar:
+        st.header("Configuration")
+        st.metric("Budget Remaining", f"${USER_CONFIG['daily_budget'] - USER_CONFIG['spent_today']:.2f}")
+        st.progress(min(USER_CONFIG['spent_today'] / USER_CONFIG['daily_budget'], 1.0))
+        day_window = USER_CONFIG.get("budgets", {}).get(USER_CONFIG.get("currency"), {}).get("windows", {}).get("day")
+        if day_window:
+            st.caption(f"Resets {day_window['resets_at'][:16].replace('T', ' ')} ({USER_CONFIG.get('timezone', 'UTC')})")
+
+        if st.button("Reset App State"):
+            try:
+                api.reset_state()
+            except:
+                pass # Ignore if API is down, still clear frontend
+            st.session_state.memory.clear()
+            st.session_state.last_transaction = None
+            st.rerun()
 
 except Exception:
+    SNAPSHOT = None
     USER_CONFIG = {"daily_budget": 0, "spent_today": 0} # Fallback
+    st.sidebar.error("Could not fetch config")
     # Don't error here, let the main app handle connection errors if needed
 
 # --- SUCCESS REDIRECT HANDLING ---
@@ -149,8 +152,7 @@ if "status" in query_params and query_params["status"] == "success":
     if transaction_id:
         try:
             # Fetch transaction details
-            all_txs = requests.get(f"{API_URL}/v1/admin/transactions").json()
-            tx = next((t for t in all_txs if t['id'] == transaction_id), None)
+            tx = api.get_transaction(transaction_id)
             
             if tx:
                 with st.container(border=True):
@@ -200,7 +202,7 @@ with tab1:
     col_header, col_clear = st.columns([4, 1])
     col_header.markdown('<div class="section-header">AI Shopping Assistant</div>', unsafe_allow_html=True)
     if col_clear.button("Clear Chat", type="secondary"):
-        st.session_state.messages = []
+        st.session_state.memory.clear()
         st.session_state.last_transaction = None
         st.rerun()
 
@@ -213,22 +215,22 @@ with tab1:
         
         if col1.button("Buy Coffee ($5)"):
             st.session_state.last_transaction = None
-            st.session_state.messages = []  # Clear history to force fresh context
+            st.session_state.memory.clear()  # Clear history to force fresh context
             st.session_state.pending_prompt = "buy coffee from Starbucks for $5"
             st.rerun()
         if col2.button("Buy Laptop ($2k)"):
             st.session_state.last_transaction = None
-            st.session_state.messages = []  # Clear history to force fresh context
+            st.session_state.memory.clear()  # Clear history to force fresh context
             st.session_state.pending_prompt = "buy a MacBook Pro from Apple for $2000"
             st.rerun()
         if col3.button("Mystery Box ($100)"):
             st.session_state.last_transaction = None
-            st.session_state.messages = []  # Clear history to force fresh context
+            st.session_state.memory.clear()  # Clear history to force fresh context
             st.session_state.pending_prompt = "buy a mystery box from sketchy-deals.com for $100"
             st.rerun()
         if col4.button("Buy Car ($50k)"):
             st.session_state.last_transaction = None
-            st.session_state.messages = []  # Clear history to force fresh context
+            st.session_state.memory.clear()  # Clear history to force fresh context
             st.session_state.pending_prompt = "buy a Tesla Model 3 for $50000"
             st.rerun()
 
@@ -261,7 +263,7 @@ with tab1:
                 ]
 
                 # Store user message
-                st.session_state.messages.append({"role": "user", "content": prompt})
+                st.session_state.memory.add({"role": "user", "content": prompt})
 
                 # Build messages with full conversation history
                 system_prompt = """You are a decisive shopping assistant. Your ONLY goal is to execute purchase requests immediately.
@@ -289,75 +291,53 @@ IMPORTANT RULES:
 
 6. NEVER say "I can help you find..." or "Here are some options". JUST BUY IT."""
 
-                messages = [{"role": "system", "content": system_prompt}] + st.session_state.messages
+                messages = st.session_state.memory.build(system_prompt)
 
                 try:
-                    # First AI call - decide to use the tool
-                    response = client.chat.completions.create(
+                    # First AI call - decide to use the tool (streamed, so a direct
+                    # answer renders token by token)
+                    response_message = StreamedMessage(client.chat.completions.create(
                         model="gpt-3.5-turbo",
                         messages=messages,
                         tools=tools,
                         tool_choice="auto",
-                    )
-
-                    response_message = response.choices[0].message
+                        stream=True,
+                    ))
+                    with st.chat_message("assistant"):
+                        st.write_stream(response_message)
                     tool_calls = response_message.tool_calls
 
                     if tool_calls:
-                        # AI decided to make a payment
-                        for tool_call in tool_calls:
-                            function_args = json.loads(tool_call.function.arguments)
-
-                            # Call the API
-                            payload = {
-                                "agent_id": "streamlit_user",
-                                "merchant_name": function_args.get("merchant_name"),
-                                "amount": function_args.get("amount"),
-                                "item_description": function_args.get("item_description")
-                            }
-
-                            api_response = requests.post(f"{API_URL}/v1/agent/pay", json=payload)
-                            result = api_response.json()
-
-                            # Normalize ALL transaction fields for consistent display
-                            normalized_tx = {
-                                'id': result.get('id') or result.get('transaction_id'),
-                                'transaction_id': result.get('transaction_id') or result.get('id'),
-                                'status': result.get('status'),
-                                'message': result.get('message'),
-                                # Normalize item field
-                                'item': result.get('item') or result.get('item_description') or function_args.get('item_description'),
-                                # Normalize merchant field
-                                'merchant': result.get('merchant') or result.get('merchant_name') or function_args.get('merchant_name'),
-                                # Normalize amount field
-                                'amount': result.get('amount') or function_args.get('amount'),
-                                # Keep other fields
-                                'risk_reason': result.get('risk_reason'),
-                                'timestamp': result.get('timestamp'),
-                                'paypal_order_id': result.get('paypal_order_id'),
-                                'paypal_capture_id': result.get('paypal_capture_id'),
-                            }
-                            
-                            # Store the normalized NEW transaction (this replaces the old one)
-                            st.session_state.last_transaction = normalized_tx
-
-                            # Add tool response to messages
-                            messages.append(response_message)
-                            messages.append({
-                                "tool_call_id": tool_call.id,
-                                "role": "tool",
-                                "name": "execute_payment",
-                                "content": json.dumps(result),
-                            })
-
-                        # Second AI call - generate friendly response
-                        second_response = client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=messages,
+                        # AI decided to make a payment - authorize every item in one round trip
+                        tool_outcomes = run_tool_calls(
+                            tool_calls, agent_id="streamlit_user",
+                            api_base=api.API_URL, session=api.get_session(),
                         )
-
-                        assistant_message = second_response.choices[0].message.content
-                        st.session_state.messages.append({"role": "assistant", "content": assistant_message})
+                        api.invalidate()
+
+                        # The pay response uses the same field names as stored records,
+                        # so it can be shown as-is (the last item replaces the old one)
+                        st.session_state.last_transaction = tool_outcomes[-1].result
+
+                        # One assistant message, then one tool message per call (same order)
+                        messages.append(response_message.to_message())
+                        messages.extend(o.to_message() for o in tool_outcomes)
+                        outcomes = [(o.args, o.result) for o in tool_outcomes]
+
+                        # Fast path: APPROVED / PENDING_APPROVAL / DENIED have fixed wording,
+                        # so skip the second model round trip entirely
+                        assistant_message = templated_reply(outcomes)
+                        if assistant_message is None:
+                            # Second AI call - generate friendly response (streamed)
+                            second_response = client.chat.completions.create(
+                                model="gpt-3.5-turbo",
+                                messages=messages,
+                                stream=True,
+                            )
+                            with st.chat_message("assistant"):
+                                assistant_message = st.write_stream(StreamedMessage(second_response))
+
+                        st.session_state.memory.add({"role": "assistant", "content": assistant_message})
                         
                         # Force a rerun to update the UI with the new transaction
                         st.rerun()
@@ -365,7 +345,7 @@ IMPORTANT RULES:
                     else:
                         # AI didn't use the tool (maybe clarifying question)
                         assistant_message = response_message.content
-                        st.session_state.messages.append({"role": "assistant", "content": assistant_message})
+                        st.session_state.memory.add({"role": "assistant", "content": assistant_message})
                         st.rerun()
 
                 except Exception as e:
@@ -374,7 +354,11 @@ IMPORTANT RULES:
 
 
         # Render Chat History
-        for msg in st.session_state.messages:
+        memory = st.session_state.memory
+        if memory.evicted_turns:
+            with st.expander(f"{memory.evicted_turns} earlier turn(s) summarized"):
+                st.text(memory.summary)
+        for msg in memory.window:
             if msg['role'] == 'user':
                 with st.chat_message("user"):
                     st.write(msg['content'])
@@ -385,10 +369,9 @@ IMPORTANT RULES:
         # Render Active Transaction (if any) - AFTER chat messages
         tx = st.session_state.last_transaction
         if tx:
-            # Get transaction details with proper fallbacks
-            item = tx.get('item') or tx.get('item_description') or 'N/A'
+            item = tx.get('item') or 'N/A'
             amount = tx.get('amount') or 0  # Ensure amount is never None
-            merchant = tx.get('merchant') or tx.get('merchant_name') or 'N/A'
+            merchant = tx.get('merchant') or 'N/A'
             status = tx.get('status', 'UNKNOWN')
             
             with st.status(f"Transaction Status: {status}", expanded=True):
@@ -401,11 +384,10 @@ IMPORTANT RULES:
                     if st.button("Check Status", key="check_status_btn"):
                         # Only fetch updated status when user explicitly checks
                         try:
-                            all_txs = requests.get(f"{API_URL}/v1/admin/transactions").json()
-                            stored_tx_id = tx.get('transaction_id') or tx.get('id')
-                            current_tx = next((t for t in all_txs if t.get('id') == stored_tx_id), None)
+                            api.invalidate()  # Explicit check: always go to the API
+                            stored_tx_id = tx.get('id')
+                            current_tx = api.get_transaction(stored_tx_id)
                             if current_tx:
-                                current_tx['transaction_id'] = current_tx['id']
                                 st.session_state.last_transaction = current_tx
                         except:
                             pass
@@ -415,7 +397,7 @@ IMPORTANT RULES:
                     st.success("Approved! Ready for payment.")
                     
                     # Get the transaction ID to ensure unique iframe rendering
-                    tx_id = tx.get('transaction_id') or tx.get('id')
+                    tx_id = tx.get('id')
                     
                     # Add cache-busting parameter to force iframe reload on transaction change
                     import time
@@ -454,10 +436,13 @@ with tab2:
 
     # Refresh button
     if st.button("Refresh Data"):
+        api.invalidate()
         st.rerun()
 
     # --- METRICS SECTION ---
     try:
+        if SNAPSHOT is None:
+            raise ConnectionError("API unavailable")
         col1, col2, col3 = st.columns(3)
         col1.metric("Daily Budget", f"${USER_CONFIG['daily_budget']}")
         col2.metric("Spent Today", f"${USER_CONFIG['spent_today']}")
@@ -474,54 +459,188 @@ with tab2:
     # --- PENDING APPROVALS (THE CORE FEATURE) ---
     st.subheader("Action Required: Pending Approvals")
 
-    # Fetch all transactions
-    tx_res = requests.get(f"{API_URL}/v1/admin/transactions")
-    if tx_res.status_code == 200:
-        transactions = tx_res.json()
-
-        # Filter for PENDING status
-        pending = [t for t in transactions if t['status'] == 'PENDING_APPROVAL']
+    # Pending queue comes from the cached snapshot, most urgent first
+    pending = SNAPSHOT["pending"]
+    pending_count = SNAPSHOT.get("pending_count", len(pending))
 
-        if not pending:
-            st.success("No pending approvals.")
-        else:
-            for tx in pending:
-                with st.container(border=True):
-                    c1, c2, c3, c4, c5 = st.columns([2, 1, 2, 1, 1])
-                    c1.write(f"**Merchant:** {tx['merchant']}")
-                    c2.write(f"**Amount:** ${tx['amount']}")
-                    c3.write(f"**Item:** {tx['item']}")
-                    c3.caption(f"Risk Reason: {tx['risk_reason']}")
-
-                    # BUTTONS
-                    if c4.button("Approve", key=f"app_{tx['id']}"):
-                        payload = {"transaction_id": tx['id'], "decision": "APPROVE"}
-                        requests.post(f"{API_URL}/v1/admin/approve", json=payload)
-                        st.success("Approved! Return to the Shopping Agent tab to pay.")
-                        time.sleep(2)
-                        st.rerun() # Refresh page
-
-                    if c5.button("Deny", key=f"den_{tx['id']}"):
-                        payload = {"transaction_id": tx['id'], "decision": "DENY"}
-                        requests.post(f"{API_URL}/v1/admin/approve", json=payload)
-                        st.rerun()
+    if not pending:
+        st.success("No pending approvals.")
     else:
-        st.warning("Could not load transactions.")
+        # --- BULK ACTIONS ---
+        # One request clears any number of items; no per-row round trips.
+        if pending_count > len(pending):
+            st.caption(f"Showing the {len(pending)} most urgent of {pending_count} pending items.")
+        with st.expander(f"Bulk actions ({pending_count} pending)", expanded=pending_count > 5):
+            by_id = {t['id']: t for t in pending}
+            selected = st.multiselect(
+                "Select transactions",
+                options=list(by_id),
+                format_func=lambda i: f"{by_id[i]['merchant']} · ${by_id[i]['amount']} · {by_id[i]['item']}",
+                key="bulk_selected",
+            )
+            b1, b2 = st.columns(2)
+            if b1.button("Approve selected", disabled=not selected, key="bulk_app_sel"):
+                res = api.bulk_decide("APPROVE", transaction_ids=selected)
+                st.toast(f"Approved {res.json().get('count', 0)} transactions" if res.ok else res.text)
+                st.rerun()
+            if b2.button("Deny selected", disabled=not selected, key="bulk_den_sel"):
+                res = api.bulk_decide("DENY", transaction_ids=selected)
+                st.toast(f"Denied {res.json().get('count', 0)} transactions" if res.ok else res.text)
+                st.rerun()
+
+            st.markdown("**...or everything matching a filter**")
+            merchants = sorted({t['merchant'] for t in pending})
+            reasons = sorted({t['risk_reason'] for t in pending if t['risk_reason']})
+            currencies = sorted({t.get('currency', 'USD') for t in pending})
+            f1, f2, f3, f4, f5 = st.columns(5)
+            f_merchant = f1.selectbox("Merchant", ["Any"] + merchants, key="bulk_merchant")
+            f_reason = f2.selectbox("Risk reason", ["Any"] + reasons, key="bulk_reason")
+            f_currency = f3.selectbox("Currency", ["Any"] + currencies, key="bulk_currency")
+            f_min = f4.number_input("Min amount", min_value=0.0, value=0.0, key="bulk_min")
+            f_max = f5.number_input("Max amount (0 = no limit)", min_value=0.0, value=0.0, key="bulk_max")
+            filters = {
+                "merchant": None if f_merchant == "Any" else f_merchant,
+                "risk_reason": None if f_reason == "Any" else f_reason,
+                "currency": None if f_currency == "Any" else f_currency,
+                "min_amount": f_min or None,
+                "max_amount": f_max or None,
+            }
+            matching = [
+                t for t in pending
+                if (filters["merchant"] is None or t['merchant'] == filters["merchant"])
+                and (filters["risk_reason"] is None or t['risk_reason'] == filters["risk_reason"])
+                and (filters["currency"] is None or t.get('currency', 'USD') == filters["currency"])
+                and (filters["min_amount"] is None or t['amount'] >= filters["min_amount"])
+                and (filters["max_amount"] is None or t['amount'] <= filters["max_amount"])
+            ]
+            no_filter = all(v is None for v in filters.values())
+            # Amounts are only comparable within one currency
+            needs_currency = filters["currency"] is None and (f_min or f_max)
+            if needs_currency:
+                st.caption("Pick a currency to filter by amount.")
+                no_filter = True
+            if pending_count > len(pending):
+                st.caption("Filter actions apply to every pending item, not just the ones shown.")
+            b3, b4 = st.columns(2)
+            if b3.button(f"Approve {len(matching)} matching", disabled=no_filter or not matching, key="bulk_app_flt"):
+                res = api.bulk_decide("APPROVE", **filters)
+                st.toast(f"Approved {res.json().get('count', 0)} transactions" if res.ok else res.text)
+                st.rerun()
+            if b4.button(f"Deny {len(matching)} matching", disabled=no_filter or not matching, key="bulk_den_flt"):
+                res = api.bulk_decide("DENY", **filters)
+                st.toast(f"Denied {res.json().get('count', 0)} transactions" if res.ok else res.text)
+                st.rerun()
+
+        for tx in pending:
+            with st.container(border=True):
+                c1, c2, c3, c4, c5 = st.columns([2, 1, 2, 1, 1])
+                c1.write(f"**Merchant:** {tx['merchant']}")
+                c2.write(f"**Amount:** ${tx['amount']}")
+                c3.write(f"**Item:** {tx['item']}")
+                c3.caption(f"Risk Reason: {tx['risk_reason']} · Priority {tx.get('priority', '-')}")
+
+                # BUTTONS
+                if c4.button("Approve", key=f"app_{tx['id']}"):
+                    api.decide(tx['id'], "APPROVE")
+                    st.toast("Approved! Return to the Shopping Agent tab to pay.")
+                    st.rerun() # Refresh page
+
+                if c5.button("Deny", key=f"den_{tx['id']}"):
+                    api.decide(tx['id'], "DENY")
+                    st.rerun()
+
+    st.divider()
+
+    # --- SPEND ANALYTICS (precomputed rollups, part of the one snapshot request) ---
+    st.subheader("📊 Spend Analytics")
+    panels = SNAPSHOT.get("analytics", {})
+    summary = panels.get("summary")
+    by_merchant = panels.get("merchant", [])
+    by_hour = panels.get("hour", [])
+    by_agent = panels.get("agent", [])
+
+    if summary:
+        def pct(rate):
+            return "—" if rate is None else f"{rate:.0%}"
+
+        latency = summary["time_to_approve_seconds"]
+        a1, a2, a3, a4 = st.columns(4)
+        a1.metric("Auto-Approved", pct(summary["auto_approval_rate"]))
+        a2.metric("Flagged for Review", pct(summary["flag_rate"]))
+        a3.metric("Human Approval Rate", pct(summary["human_approval_rate"]))
+        a4.metric("Time to Approve (p50 / p90)",
+                  "—" if latency["p50"] is None else f"{latency['p50']:.0f}s / {latency['p90']:.0f}s")
+
+        base = USER_CONFIG.get("currency", "USD")
+        ch1, ch2 = st.columns(2)
+        if by_merchant:
+            ch1.caption(f"Approved spend by merchant ({base})")
+            ch1.bar_chart(pd.DataFrame(
+                {"merchant": [r["key"] for r in by_merchant],
+                 "approved": [r["approved"].get(base, 0.0) for r in by_merchant]}
+            ).set_index("merchant"))
+        if by_agent:
+            ch2.caption("Requests by agent and status")
+            ch2.bar_chart(pd.DataFrame(
+                [{"agent": r["key"], **r["by_status"]} for r in by_agent]
+            ).set_index("agent").fillna(0))
+        if by_hour:
+            st.caption(f"Hourly spend ({base})")
+            st.line_chart(pd.DataFrame(
+                {"hour": [r["key"] for r in by_hour],
+                 "requested": [r["requested"].get(base, 0.0) for r in by_hour],
+                 "approved": [r["approved"].get(base, 0.0) for r in by_hour]}
+            ).set_index("hour"))
 
     st.divider()
 
     # --- TRANSACTION HISTORY ---
     st.subheader("📜 Transaction Log")
 
-    if transactions:
-        # Convert to DataFrame for a nice table
-        df = pd.DataFrame(transactions)
-        # Reorder columns
-        df = df[['timestamp', 'merchant', 'amount', 'item', 'status', 'risk_reason']]
+    # Paging, sorting and filtering all happen server-side; only one page is shipped
+    LOG_SORT_FIELDS = ["timestamp", "status"]  # the orders the API has indexes for
+    LOG_STATUSES = ["All", "PENDING_APPROVAL", "APPROVED", "COMPLETED", "DENIED", "REFUNDED"]
+    STATUS_BADGES = {"approved": "🟢", "denied": "🔴", "pending": "🟠", "other": "⚪"}
+
+    f1, f2, f3, f4 = st.columns([2, 2, 1, 1])
+    log_status = f1.selectbox("Status", LOG_STATUSES, key="log_status")
+    log_sort = f2.selectbox("Sort by", LOG_SORT_FIELDS, key="log_sort")
+    log_desc = f3.toggle("Descending", value=True, key="log_desc")
+    log_page_size = f4.selectbox("Rows", [25, 50, 100, 250], index=1, key="log_page_size")
+    status_filter = None if log_status == "All" else log_status
 
-        # Color code the status
-        def color_status(val):
-            color = 'green' if val == 'APPROVED' else 'red' if val == 'DENIED' else 'orange'
-            return f'color: {color}'
+    try:
+        # One request per rerun: fetch the stored page number, size the pager from its total
+        log_page = max(int(st.session_state.get("log_page", 1)), 1)
+        page = api.get_transactions_page((log_page - 1) * log_page_size, log_page_size,
+                                         log_sort, log_desc, status_filter)
+        total = page["total"]
+        page_count = max((total + log_page_size - 1) // log_page_size, 1)
+        if log_page > page_count:  # filter or page size shrank the log under us
+            log_page = st.session_state["log_page"] = page_count
+            page = api.get_transactions_page((log_page - 1) * log_page_size, log_page_size,
+                                             log_sort, log_desc, status_filter)
+        st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key="log_page")
+    except Exception:
+        page = None
+        st.warning("Could not load transactions.")
+
+    if page and page["items"]:
+        df = pd.DataFrame(page["items"])
+        # Badge from the server-side category: one dict lookup per row, no Styler pass
+        df["status"] = df["status_category"].map(STATUS_BADGES).fillna("⚪") + " " + df["status"]
+        df = df[['timestamp', 'merchant', 'amount', 'item', 'status', 'risk_reason']]
 
-        st.dataframe(df.style.map(color_status, subset=['status']), use_container_width=True)
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"amount": st.column_config.NumberColumn("amount", format="$%.2f")},
+        )
+        st.caption(f"Showing {page['offset'] + 1}-{page['offset'] + len(page['items'])} of {total}")
+    elif page is not None:
+        st.info("No transactions yet.")
+
+    e1, e2 = st.columns(2)
+    e1.link_button("Export CSV", api.export_url("csv", status_filter), use_container_width=True)
+    e2.link_button("Export Parquet", api.export_url("parquet", status_filter), use_container_width=True)
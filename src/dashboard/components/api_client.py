@@ -0,0 +1,115 @@
+import os
+import time
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+# --- CONFIGURATION ---
+API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+TIMEOUT = (2, 10)      # (connect, read) seconds
+CACHE_TTL = 5          # seconds - short enough to feel "live"
+
+
+@st.cache_resource
+def get_session():
+    """One pooled HTTP session shared by every rerun (keep-alive, no reconnects)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get(path, **params):
+    res = get_session().get(f"{API_URL}{path}", params=params or None, timeout=TIMEOUT)
+    res.raise_for_status()
+    return res.json()
+
+
+def _post(path, payload=None):
+    return get_session().post(f"{API_URL}{path}", json=payload, timeout=TIMEOUT)
+
+
+# --- CACHED READS ---
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_snapshot(recent_limit=0):
+    """Config + pending queue + analytics in one request (the log itself is paged separately)"""
+    return _get("/v1/admin/dashboard", recent_limit=recent_limit)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_transactions_page(offset=0, limit=50, sort_by="timestamp", descending=True, status=None):
+    """One server-side page of the transaction log"""
+    params = {"offset": offset, "limit": limit, "sort_by": sort_by, "descending": descending}
+    if status:
+        params["status"] = status
+    return _get("/v1/admin/transactions/page", **params)
+
+
+def export_url(fmt="csv", status=None):
+    """Direct link to the streamed export (the browser downloads from the API)"""
+    url = f"{API_URL}/v1/admin/transactions/export?format={fmt}"
+    return f"{url}&status={status}" if status else url
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_transaction(transaction_id):
+    try:
+        return _get(f"/v1/admin/transactions/{transaction_id}")
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
+
+
+def wait_for_status(transaction_id, statuses=("COMPLETED", "REFUNDED"), timeout=6.0, interval=0.5):
+    """Poll (uncached) until the transaction reaches one of statuses; returns the last record seen"""
+    deadline = time.monotonic() + timeout
+    while True:
+        res = get_session().get(f"{API_URL}/v1/admin/transactions/{transaction_id}", timeout=TIMEOUT)
+        tx = res.json() if res.ok else None
+        if tx is None or tx.get("status") in statuses or time.monotonic() >= deadline:
+            return tx
+        time.sleep(interval)
+
+
+def invalidate():
+    """Drop every cached read. Call after anything that mutates backend state."""
+    get_snapshot.clear()
+    get_transactions_page.clear()
+    get_transaction.clear()
+
+
+# --- WRITES (always invalidate) ---
+def decide(transaction_id, decision):
+    """Approve or deny a pending transaction (decision: APPROVE / DENY)"""
+    res = _post("/v1/admin/approve", {"transaction_id": transaction_id, "decision": decision})
+    invalidate()
+    return res
+
+
+def bulk_decide(decision, transaction_ids=None, **filters):
+    """
+    Approve or deny many pending transactions in one request.
+    filters: merchant, risk_reason, currency, min_amount, max_amount (amount bounds need a currency)
+    """
+    payload = {"decision": decision, **{k: v for k, v in filters.items() if v is not None}}
+    if transaction_ids is not None:
+        payload["transaction_ids"] = list(transaction_ids)
+    res = _post("/v1/admin/approve/bulk", payload)
+    invalidate()
+    return res
+
+
+def reset_state():
+    try:
+        return _post("/reset")
+    finally:
+        invalidate()
+
+
+def capture_order(order_id, transaction_id, wait=True):
+    """wait=False queues the capture server-side and returns immediately"""
+    res = _post("/v1/paypal/capture-order", {"order_id": order_id, "transaction_id": transaction_id, "wait": wait})
+    invalidate()
+    return res
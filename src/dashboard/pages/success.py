@@ -1,13 +1,11 @@
 import streamlit as st
-import requests
-import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-st.set_page_config(page_title="Payment Success - AgentGuard", page_icon="🎉")
+from src.dashboard.components import api_client as api
 
-API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+st.set_page_config(page_title="Payment Success - AgentGuard", page_icon="🎉")
 
 # Get query parameters
 query_params = st.query_params
@@ -20,59 +18,56 @@ if "token" in query_params and "tx" in query_params:
     
     with st.spinner("Processing your payment..."):
         try:
-            # Capture the payment
-            capture_response = requests.post(f"{API_URL}/v1/paypal/capture-order", json={
-                "order_id": paypal_order_id,
-                "transaction_id": transaction_id
-            })
+            # Hand the capture to the backend workers; this returns right away
+            capture_response = api.capture_order(paypal_order_id, transaction_id, wait=False)
             
             if capture_response.status_code == 200:
-                data = capture_response.json()
+                # Wait a few seconds for the workers, never for PayPal itself
+                tx = api.wait_for_status(transaction_id)
                 
-                # Fetch transaction details
-                try:
-                    all_txs = requests.get(f"{API_URL}/v1/admin/transactions").json()
-                    tx = next((t for t in all_txs if t['id'] == transaction_id), None)
-                    
-                    if tx:
+                if tx:
+                    if tx.get("status") == "COMPLETED":
                         st.success("Your payment has been processed successfully!")
+                    else:
+                        st.info("Payment approved - PayPal is still confirming it. Your budget updates as soon as it completes.")
+                        if st.button("🔄 Refresh status"):
+                            st.rerun()
+                    
+                    # Transaction Receipt
+                    with st.container(border=True):
+                        st.markdown("### 🧾 Transaction Receipt")
+                        st.divider()
                         
-                        # Transaction Receipt
-                        with st.container(border=True):
-                            st.markdown("### 🧾 Transaction Receipt")
-                            st.divider()
-                            
-                            col1, col2 = st.columns(2)
-                            col1.write("**Merchant:**")
-                            col2.write(tx.get('merchant_name', 'Unknown'))
-                            
-                            col1.write("**Item:**")
-                            col2.write(tx.get('item_description', 'Unknown'))
-                            
-                            col1.write("**Amount:**")
-                            col2.write(f"${tx.get('amount', 0):.2f}")
-                            
-                            st.divider()
-                            col1.write("**Transaction ID:**")
-                            col2.code(tx.get('id', 'N/A'))
-                            
-                            col1.write("**PayPal Order ID:**")
-                            col2.code(paypal_order_id)
-                            
-                            st.caption("Processed via AgentGuard Secure Gateway")
+                        col1, col2 = st.columns(2)
+                        col1.write("**Merchant:**")
+                        col2.write(tx.get('merchant', 'Unknown'))
                         
-                        st.balloons()
+                        col1.write("**Item:**")
+                        col2.write(tx.get('item', 'Unknown'))
                         
-                        # Back to chat button
-                        if st.button("🏠 Back to Shopping Agent", type="primary", use_container_width=True):
-                            st.switch_page("app.py")
-                    else:
-                        st.warning("Payment captured, but transaction details not found.")
-                        if st.button("🏠 Back to Shopping Agent", type="primary"):
-                            st.switch_page("app.py")
-                            
-                except Exception as e:
-                    st.warning(f"Payment captured successfully! (Transaction ID: {transaction_id})")
+                        col1.write("**Amount:**")
+                        col2.write(f"${tx.get('amount', 0):.2f}")
+                        
+                        col1.write("**Status:**")
+                        col2.write(tx.get('status', 'Unknown'))
+                        
+                        st.divider()
+                        col1.write("**Transaction ID:**")
+                        col2.code(tx.get('id', 'N/A'))
+                        
+                        col1.write("**PayPal Order ID:**")
+                        col2.code(paypal_order_id)
+                        
+                        st.caption("Processed via AgentGuard Secure Gateway")
+                    
+                    if tx.get("status") == "COMPLETED":
+                        st.balloons()
+                    
+                    # Back to chat button
+                    if st.button("🏠 Back to Shopping Agent", type="primary", use_container_width=True):
+                        st.switch_page("app.py")
+                else:
+                    st.warning(f"Payment received, but transaction details not found. (Transaction ID: {transaction_id})")
                     if st.button("🏠 Back to Shopping Agent", type="primary"):
                         st.switch_page("app.py")
             else:
@@ -0,0 +1,90 @@
+"""
+Text folding, the deletion index and merchant/item classification:
+evasion spellings must be caught, ordinary names must pass.
+
+    python -m pytest tests
+"""
+import pytest
+
+from src.api.fuzzy import DeletionIndex, edit_distance, fold, max_edits, phrase, tokens
+from src.api.rules import (ITEM_RISK_REASON, LOOKALIKE_RISK_REASON, MERCHANT_RISK_REASON, RuleSet,
+                           classify, normalize)
+
+RULES = RuleSet.from_config({"blocked_merchants": ["sketchy-crypto.com", "unknown-seller.net"]})
+
+
+def check(merchant, item="book"):
+    return classify(RULES, normalize(merchant), normalize(item))
+
+
+@pytest.mark.parametrize("text, folded", [
+    ("S-k-3-t-c-h-Y.com", "sketchycom"),
+    ("ѕketchy", "sketchy"),            # Cyrillic dze
+    ("ｓｃａｍ", "scam"),               # fullwidth
+    ("$c@m", "scam"),
+    ("Café", "cafe"),
+])
+def test_fold(text, folded):
+    assert fold(text) == folded
+
+
+def test_tokens_rejoin_spelled_out_letters_only():
+    assert tokens("s k e t c h y deals") == ["sketchy", "deals"]
+    assert tokens("d.a.r.k-web-shop") == ["dark", "web", "shop"]
+    assert tokens("Bass Camera") == ["bass", "camera"]
+    assert phrase("Glass Cameras Inc") == "glass cameras inc"
+
+
+def test_deletion_index_matches_brute_force():
+    terms = ["sketchycryptocom", "unknownsellernet", "amazon", "walmart", "bestbuy", "ebay"]
+    index = DeletionIndex(terms)
+    assert index.lookup("sketchycryptoco") == ("sketchycryptocom", 1)
+    assert index.lookup("unknownselernet") == ("unknownsellernet", 1)
+    assert index.lookup("amazon") == ("amazon", 0)
+    assert index.lookup("ebey") is None              # short terms must match exactly
+    assert index.lookup("target") is None
+    for word in ["sketchycryptcom", "sketchicryptocom", "walmartt", "bestbuyy", "amazn", "ebya", "costco"]:
+        within = [(edit_distance(word, t, max_edits(t)), t) for t in terms]
+        within = [(d, t) for d, t in within if d <= max_edits(t)]
+        hit = index.lookup(word)
+        assert (hit[1] if hit else None) == (min(within)[0] if within else None)
+
+
+@pytest.mark.parametrize("merchant", [
+    "sk3tchy deals", "ѕketchy shop", "s-k-e-t-c-h-y", "s k e t c h y deals",
+    "d.a.r.k-web-shop", "$cam store", "SCAMMY outlet", "Fr@ud Inc",
+])
+def test_disguised_merchant_keywords_are_flagged(merchant):
+    assert check(merchant).risk_reason == MERCHANT_RISK_REASON
+
+
+@pytest.mark.parametrize("merchant", ["SKETCHY-CRYPTO.COM", "sk3tchy-crypt0.com", "unknown seller.net"])
+def test_folded_blocklist_names_are_blocked(merchant):
+    assert check(merchant).blocked
+
+
+def test_near_miss_of_blocklisted_name_goes_to_review():
+    assert check("sketchy-crypto.co").risk_reason == LOOKALIKE_RISK_REASON
+
+
+@pytest.mark.parametrize("item", ["g1ft c@rd", "giftcard", "gift-card", "myst3ry box", "c.a.s.i.n.o chips"])
+def test_disguised_item_keywords_are_flagged(item):
+    assert check("Walmart", item).risk_reason == ITEM_RISK_REASON
+
+
+@pytest.mark.parametrize("merchant", [
+    # keyword glued across word boundaries
+    "Glass Cameras Inc", "Bass Camera", "Haus Camping", "Kids Cam Shop",
+    "Fra Udine", "Sha Dynasty", "Aloha Cknives",
+    # a few edits away from a keyword, but real words
+    "Trusted Shops", "Sammy's Pizza", "Auspicious Gifts", "Sketch.com", "Entrusted Home",
+    "Amazon", "Best Buy",
+])
+def test_ordinary_merchants_pass(merchant):
+    assert check(merchant) == check("Walmart")
+    assert not check(merchant).blocked and check(merchant).risk_reason == ""
+
+
+@pytest.mark.parametrize("item", ["Cas in orange", "phone casing", "headphones"])
+def test_ordinary_items_pass(item):
+    assert check("Walmart", item).risk_reason == ""
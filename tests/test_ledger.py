@@ -0,0 +1,101 @@
+"""
+BudgetLedger rollover, refunds and concurrency, driven by an injected clock.
+
+    python -m pytest tests
+"""
+import itertools
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from src.api.ledger import BudgetLedger
+from src.api.money import Money
+
+TZ = "America/New_York"
+
+
+def at(*args):
+    """Epoch seconds for a local wall-clock time in TZ"""
+    return datetime(*args, tzinfo=ZoneInfo(TZ)).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def usd(amount):
+    return Money.of(amount, "USD")
+
+
+def test_day_rolls_over_at_local_midnight():
+    clock = FakeClock(at(2026, 3, 10, 23, 59))
+    ledger = BudgetLedger({"USD": usd(100)}, tz=TZ, clock=clock)
+    ledger.charge(usd(40))
+    assert ledger.remaining("USD") == usd(60)
+
+    clock.now = at(2026, 3, 11, 0, 0)
+    assert ledger.spent("USD") == usd(0)
+    assert ledger.remaining("USD") == usd(100)
+    assert [row["bucket"] for row in ledger.history("day")] == ["2026-03-11", "2026-03-10"]
+    assert ledger.history("day")[1]["spent"] == {"USD": 40.0}
+
+
+def test_tightest_window_limits_headroom():
+    clock = FakeClock(at(2026, 3, 10, 9, 30))
+    ledger = BudgetLedger({"USD": usd(100)}, window_limits={"hour": {"USD": usd(30)}}, tz=TZ, clock=clock)
+    ledger.charge(usd(25))
+    assert ledger.headroom("USD") == (usd(5), "hour")
+
+    clock.now = at(2026, 3, 10, 10, 0)
+    assert ledger.headroom("USD") == (usd(30), "hour")
+    assert ledger.spent("USD", "day") == usd(25)
+
+
+def test_refund_credits_the_day_it_was_charged():
+    clock = FakeClock(at(2026, 3, 10, 15, 0))
+    ledger = BudgetLedger({"USD": usd(100)}, tz=TZ, clock=clock)
+    charged_at = ledger.charge(usd(70))
+
+    clock.now = at(2026, 3, 11, 9, 0)
+    ledger.charge(usd(10))
+    ledger.refund(usd(70), charged_at=charged_at)
+
+    assert ledger.spent("USD") == usd(10)  # today's headroom is unchanged
+    assert ledger.history("day")[1] == {"bucket": "2026-03-10", "spent": {"USD": 0.0}}
+
+
+def test_refund_never_goes_below_zero():
+    ledger = BudgetLedger({"USD": usd(100)}, tz=TZ, clock=FakeClock(at(2026, 3, 10, 12, 0)))
+    charged_at = ledger.charge(usd(10))
+    ledger.refund(usd(50), charged_at=charged_at)
+    assert ledger.spent("USD") == usd(0)
+
+
+def test_concurrent_charges_across_midnight_sum_exactly():
+    # Every clock read moves time forward; midnight falls in the middle of the run
+    threads, charges = 8, 500
+    start = at(2026, 3, 10, 23, 59, 59)
+    ticks = itertools.count()
+    step = 2.0 / (threads * charges)  # one clock read per charge: the run spans 2 seconds
+    ledger = BudgetLedger({"USD": usd(10**6)}, tz=TZ, clock=lambda: start + next(ticks) * step)
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        for _ in range(charges):
+            ledger.charge(Money(1, "USD"))
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    rows = {row["bucket"]: row["spent"].get("USD", 0.0) for row in ledger.history("day")}
+    assert set(rows) == {"2026-03-11", "2026-03-10"}
+    assert all(rows.values())  # both days received charges
+    assert round(sum(rows.values()) * 100) == threads * charges